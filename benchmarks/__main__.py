@@ -0,0 +1,166 @@
+"""Module allowing for ``python -m benchmarks ...``."""
+
+# Standarts
+import json
+import itertools
+
+# Args
+import argparse
+
+# Multiprocessing
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# ProxiesTaster
+from proxies_taster.loops import uvloop
+
+# Benchmarks
+from .fake_proxies import serve
+from .harness import run_size
+
+
+def init_parser():
+    """
+    Иницилизация парсера
+
+    :return: Возвращает иницилизированный парсер
+    """
+    parser = argparse.ArgumentParser(
+        description=' '.join(
+            [
+                'Замер скорости проверки прокси на локальных',
+                'прокси (SOCKS4, SOCKS5, HTTP) и локальном',
+                '"судье", без доступа к сети'
+            ]
+        )
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs='+',
+        type=int,
+        help="Количество проверяемых прокси в каждом замере",
+        default=[1000, 10000, 100000]
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        help="Количество \"воркеров\"",
+        default=200
+    )
+    parser.add_argument(
+        "--loops",
+        nargs='+',
+        choices=('asyncio', 'uvloop'),
+        help="Реализации event loop для сравнения (по-умолчанию asyncio и uvloop, если он установлен)",
+        default=['asyncio', 'uvloop'] if uvloop else ['asyncio']
+    )
+    parser.add_argument(
+        "--working",
+        type=float,
+        help="Доля рабочих прокси",
+        default=0.1
+    )
+    parser.add_argument(
+        "--dead",
+        type=float,
+        help="Доля нерабочих прокси (порт без сервера)",
+        default=0.7
+    )
+    parser.add_argument(
+        "--slow",
+        type=float,
+        help="Доля медленных прокси",
+        default=0.1
+    )
+    parser.add_argument(
+        "--garbage",
+        type=float,
+        help="Доля прокси, отвечающих мусором",
+        default=0.1
+    )
+    parser.add_argument(
+        "--slow-delay",
+        type=float,
+        help="Задержка медленных прокси перед ответом (в секундах)",
+        default=1
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Зерно генератора списка прокси",
+        default=0
+    )
+    parser.add_argument(
+        "--json",
+        help="Выводить результаты в формате JSON (по строке на замер)",
+        action='store_true',
+        default=False
+    )
+    return parser
+
+
+def main():
+    """
+    Запускает прокси в отдельном
+    процессе и делает замеры для
+    каждого количества прокси
+    """
+    parser = init_parser()
+    args = parser.parse_args()
+    if 'uvloop' in args.loops and uvloop is None:
+        parser.error('uvloop is not installed (pip install uvloop)')
+
+    ratios = {
+        'working': args.working,
+        'dead': args.dead,
+        'slow': args.slow,
+        'garbage': args.garbage
+    }
+
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    server = context.Process(
+        target=serve, args=(sender, args.slow_delay), daemon=True
+    )
+    server.start()
+    try:
+        ports = receiver.recv()
+
+        if not args.json:
+            print(
+                f"{'size':>8} {'loop':>8} {'checks/s':>10} {'p50 ms':>8} "
+                f"{'p99 ms':>8} {'rss MB':>8} {'fds':>6} "
+                f"{'worked/expected':>16}"
+            )
+
+        for size, loop in itertools.product(args.sizes, args.loops):
+            # Каждый замер в новом процессе
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(
+                    run_size, ports, size, ratios,
+                    args.workers, args.seed, loop
+                ).result()
+
+            if args.json:
+                print(json.dumps(result), flush=True)
+                continue
+
+            print(
+                f"{result['size']:>8} "
+                f"{result['loop']:>8} "
+                f"{result['checks_per_second']:>10.1f} "
+                f"{result['p50'] * 1000:>8.1f} "
+                f"{result['p99'] * 1000:>8.1f} "
+                f"{result['peak_rss_mb']:>8.1f} "
+                f"{result['peak_fds']:>6} "
+                f"{result['worked']:>8}/{result['expected']}",
+                flush=True
+            )
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+# Typing
+from typing import Callable
+from typing import Awaitable
+
+# Standarts
+import os
+import socket
+import struct
+
+# Urllib
+from urllib.parse import urlsplit
+
+# Asyncio
+import asyncio
+
+# Aiohttp
+from aiohttp import web
+
+# Judge
+from proxies_taster.judge import judge_app
+
+
+BEHAVIORS = ('working', 'slow', 'garbage')
+"""Поведение запущенных прокси; нерабочие
+('dead') - это порты без сервера"""
+
+PROTOCOLS = ('http', 'socks4', 'socks5')
+"""Протоколы запущенных прокси"""
+
+Handler = Callable[
+    [asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]
+]
+
+ERRORS = (
+    OSError,
+    ValueError,
+    asyncio.IncompleteReadError,
+    asyncio.LimitOverrunError
+)
+"""Ошибки соединения с клиентом или целью"""
+
+
+async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """
+    Пересылает данные из одного
+    соединения в другое до конца
+
+    :param reader: Откуда читать
+    :type reader: asyncio.StreamReader
+
+    :param writer: Куда писать
+    :type writer: asyncio.StreamWriter
+    """
+    try:
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+    except ERRORS:
+        pass
+    finally:
+        writer.close()
+
+
+async def relay(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        target: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+):
+    """
+    Пересылает данные между клиентом
+    и целью в обе стороны
+
+    :param reader: Чтение клиента
+    :type reader: asyncio.StreamReader
+
+    :param writer: Запись клиента
+    :type writer: asyncio.StreamWriter
+
+    :param target: Соединение с целью
+    :type target: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+    """
+    await asyncio.gather(
+        pipe(reader, target[1]),
+        pipe(target[0], writer)
+    )
+
+
+async def http_proxy(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+):
+    """
+    HTTP прокси: CONNECT и пересылка
+    запросов с абсолютным адресом
+    """
+    # Не HTTP запрос отклоняется сразу
+    first = await reader.readexactly(1)
+    if not first.isalpha():
+        writer.write(b'HTTP/1.1 400 Bad Request\r\n\r\n')
+        return
+
+    head = first + await reader.readuntil(b'\r\n\r\n')
+    line, _, headers = head.partition(b'\r\n')
+    method, target, version = line.split(b' ', 2)
+
+    if method == b'CONNECT':
+        host, _, port = target.decode().rpartition(':')
+        connection = await asyncio.open_connection(host, int(port))
+        writer.write(b'HTTP/1.1 200 Connection established\r\n\r\n')
+        await relay(reader, writer, connection)
+        return
+
+    url = urlsplit(target.decode())
+    path = (url.path or '/') + (f"?{url.query}" if url.query else '')
+    connection = await asyncio.open_connection(url.hostname, url.port or 80)
+    connection[1].write(
+        b' '.join([method, path.encode(), version]) + b'\r\n' + headers
+    )
+    await relay(reader, writer, connection)
+
+
+async def socks4_proxy(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+):
+    """
+    SOCKS4(a) прокси
+    """
+    # Не SOCKS4 запрос отклоняется сразу
+    if await reader.readexactly(1) != b'\x04':
+        return
+
+    _, port, address = struct.unpack('>BH4s', await reader.readexactly(7))
+
+    await reader.readuntil(b'\x00')
+    host = socket.inet_ntoa(address)
+    if address[:3] == b'\x00\x00\x00' and address[3]:
+        host = (await reader.readuntil(b'\x00'))[:-1].decode()
+
+    try:
+        connection = await asyncio.open_connection(host, port)
+    except OSError:
+        writer.write(b'\x00\x5b' + bytes(6))
+        return
+
+    writer.write(b'\x00\x5a' + bytes(6))
+    await relay(reader, writer, connection)
+
+
+async def socks5_proxy(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+):
+    """
+    SOCKS5 прокси без авторизации
+    """
+    version, count = await reader.readexactly(2)
+    if version != 5:
+        return
+
+    await reader.readexactly(count)
+    writer.write(b'\x05\x00')
+
+    _, _, _, kind = await reader.readexactly(4)
+    if kind == 1:
+        host = socket.inet_ntoa(await reader.readexactly(4))
+    elif kind == 3:
+        size = (await reader.readexactly(1))[0]
+        host = (await reader.readexactly(size)).decode()
+    else:
+        host = socket.inet_ntop(
+            socket.AF_INET6, await reader.readexactly(16)
+        )
+    port, = struct.unpack('>H', await reader.readexactly(2))
+
+    try:
+        connection = await asyncio.open_connection(host, port)
+    except OSError:
+        writer.write(b'\x05\x05\x00\x01' + bytes(6))
+        return
+
+    writer.write(b'\x05\x00\x00\x01' + bytes(6))
+    await relay(reader, writer, connection)
+
+
+HANDLERS: dict[str, Handler] = {
+    'http': http_proxy,
+    'socks4': socks4_proxy,
+    'socks5': socks5_proxy
+}
+
+
+def behave(handler: Handler, behavior: str, delay: float) -> Handler:
+    """
+    Добавить прокси поведение: рабочий,
+    медленный (ждет `delay` перед ответом)
+    или отвечающий мусором
+
+    :param handler: Обработчик протокола
+    :type handler: Handler
+
+    :param behavior: Поведение
+    :type behavior: str
+
+    :param delay: Задержка медленного прокси
+    :type delay: float
+
+    :return: Обработчик соединения
+    :rtype: Handler
+    """
+    async def handle(reader, writer):
+        try:
+            if behavior == 'garbage':
+                writer.write(os.urandom(64))
+                await writer.drain()
+                return
+
+            if behavior == 'slow':
+                await asyncio.sleep(delay)
+
+            await handler(reader, writer)
+        except ERRORS:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+def free_port() -> int:
+    """
+    Свободный порт, на котором
+    никто не слушает
+
+    :return: Номер порта
+    :rtype: int
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def start(delay: float = 1, dead: int = 8) -> dict:
+    """
+    Запустить "судью" и прокси
+    всех протоколов и поведений
+
+    :param delay: Задержка медленных прокси
+    :type delay: float
+
+    :param dead: Количество портов нерабочих прокси
+    :type dead: int
+
+    :return: Порты: {'judge': port, 'dead': [port, ...],
+        'http': {'working': port, ...}, ...}
+    :rtype: dict
+    """
+    runner = web.AppRunner(judge_app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0, backlog=4096)
+    await site.start()
+
+    ports = {
+        'judge': runner.addresses[0][1],
+        'dead': [free_port() for _ in range(dead)]
+    }
+    for protocol in PROTOCOLS:
+        ports[protocol] = {}
+        for behavior in BEHAVIORS:
+            server = await asyncio.start_server(
+                behave(HANDLERS[protocol], behavior, delay),
+                '127.0.0.1', 0, backlog=4096
+            )
+            ports[protocol][behavior] = server.sockets[0].getsockname()[1]
+    return ports
+
+
+def serve(connection, delay: float = 1):
+    """
+    Запустить прокси в отдельном процессе
+    и передать их порты через `connection`
+    (работает до завершения процесса)
+
+    :param connection: Конец multiprocessing.Pipe
+    :type connection: Connection
+
+    :param delay: Задержка медленных прокси
+    :type delay: float
+    """
+    async def main():
+        connection.send(await start(delay))
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
@@ -0,0 +1,229 @@
+# Typing
+from typing import Union
+
+# Standarts
+import os
+import sys
+import time
+import random
+import resource
+
+# Asyncio
+import asyncio
+
+# ProxiesTaster
+from proxies_taster import ProxiesTaster
+from proxies_taster.loops import run
+from proxies_taster.loops import current_loop
+
+# Fake proxies
+from .fake_proxies import PROTOCOLS
+
+
+class MeasuredTaster(ProxiesTaster):
+    """
+    ProxiesTaster, который записывает
+    время каждой проверки (включая
+    ожидание свободного "воркера")
+    """
+    def __init__(self, proxies):
+        super().__init__(proxies)
+        self.latencies: list[float] = []
+
+    async def check(self, proxy, protocol=False):
+        started = time.perf_counter()
+        try:
+            return await super().check(proxy, protocol)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+
+def synthetic(
+        ports: dict,
+        size: int,
+        ratios: dict[str, float],
+        seed: int = 0
+) -> tuple[list[str], int]:
+    """
+    Список прокси с заданными долями
+    рабочих, нерабочих, медленных и
+    отвечающих мусором
+
+    :param ports: Порты запущенных прокси
+        (`fake_proxies.start`)
+    :type ports: dict
+
+    :param size: Количество прокси
+    :type size: int
+
+    :param ratios: Доли поведений: {'working': 0.1, ...}
+    :type ratios: dict[str, float]
+
+    :param seed: Зерно генератора
+    :type seed: int
+
+    :return: Прокси и ожидаемое количество рабочих
+    :rtype: tuple[list[str], int]
+    """
+    generator = random.Random(seed)
+    behaviors = [behavior for behavior in ratios if ratios[behavior] > 0]
+
+    proxies = []
+    expected = 0
+    for behavior in generator.choices(
+            behaviors, [ratios[behavior] for behavior in behaviors], k=size
+    ):
+        if behavior == 'dead':
+            port = generator.choice(ports['dead'])
+        else:
+            port = ports[generator.choice(PROTOCOLS)][behavior]
+
+        # Медленные прокси отвечают быстрее таймаута
+        expected += behavior in ('working', 'slow')
+        proxies.append(f"127.0.0.1:{port}")
+
+    return proxies, expected
+
+
+def descriptors() -> Union[int, None]:
+    """
+    Количество открытых дескрипторов
+    процесса (только Linux)
+
+    :return: Количество дескрипторов, либо None
+    :rtype: Union[int, None]
+    """
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+
+def peak_rss() -> float:
+    """
+    Пиковое потребление памяти
+    процессом в мегабайтах
+
+    :return: Мегабайты
+    :rtype: float
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20 if sys.platform == 'darwin' else 1 << 10)
+
+
+def quantile(values: list[float], q: float) -> float:
+    """
+    Квантиль отсортированного списка
+
+    :param values: Отсортированные значения
+    :type values: list[float]
+
+    :param q: Квантиль от 0 до 1
+    :type q: float
+
+    :return: Значение квантиля
+    :rtype: float
+    """
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+async def measure(
+        proxies: list[str],
+        judge: str,
+        workers: int
+) -> dict:
+    """
+    Проверить прокси и замерить
+    скорость, время проверок, память
+    и количество дескрипторов
+
+    :param proxies: Прокси для проверки
+    :type proxies: list[str]
+
+    :param judge: Адрес локального "судьи"
+    :type judge: str
+
+    :param workers: Количество "воркеров"
+    :type workers: int
+
+    :return: Результаты замеров
+    :rtype: dict
+    """
+    taster = MeasuredTaster(proxies)
+    taster.set_workers(workers)
+    taster.set_judge(judge)
+
+    peak = 0
+
+    async def sample():
+        nonlocal peak
+        while True:
+            peak = max(peak, descriptors() or 0)
+            await asyncio.sleep(0.02)
+
+    sampler = asyncio.ensure_future(sample())
+    started = time.perf_counter()
+    try:
+        worked = await taster.run()
+    finally:
+        sampler.cancel()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(taster.latencies)
+    return {
+        'size': len(proxies),
+        'workers': workers,
+        'seconds': elapsed,
+        'checks_per_second': len(proxies) / elapsed,
+        'p50': quantile(latencies, 0.5),
+        'p99': quantile(latencies, 0.99),
+        'peak_rss_mb': peak_rss(),
+        'peak_fds': peak,
+        'worked': len(worked)
+    }
+
+
+def run_size(
+        ports: dict,
+        size: int,
+        ratios: dict[str, float],
+        workers: int,
+        seed: int = 0,
+        loop: str = 'asyncio'
+) -> dict:
+    """
+    Один замер (запускается в отдельном
+    процессе, чтобы память и дескрипторы
+    не смешивались между замерами)
+
+    :param ports: Порты запущенных прокси
+    :type ports: dict
+
+    :param size: Количество прокси
+    :type size: int
+
+    :param ratios: Доли поведений прокси
+    :type ratios: dict[str, float]
+
+    :param workers: Количество "воркеров"
+    :type workers: int
+
+    :param seed: Зерно генератора
+    :type seed: int
+
+    :param loop: Реализация event loop
+    :type loop: str
+
+    :return: Результаты замеров
+    :rtype: dict
+    """
+    proxies, expected = synthetic(ports, size, ratios, seed)
+    result = run(
+        measure(proxies, f"http://127.0.0.1:{ports['judge']}/", workers),
+        loop
+    )
+    result['expected'] = expected
+    result['loop'] = current_loop()
+    return result
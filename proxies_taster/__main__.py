@@ -1,8 +1,14 @@
 """Module allowing for ``python -m proxies-taster ...``."""
 
 # Standarts
+import io
 import os
 import sys
+import ipaddress
+
+# Typing
+from typing import Union
+from typing import Iterator
 
 # Asyncio
 import asyncio
@@ -23,8 +29,20 @@ from tqdm import tqdm
 from proxies_taster import Protocol
 from proxies_taster import WorkedProxy
 from proxies_taster import ProxiesTaster
+from proxies_taster.judge import Judge
 from proxies_taster.events_data import Events
 from proxies_taster.exceptions import TooManyOpenFilesError
+from proxies_taster.parser import iter_proxies
+from proxies_taster.parser import read_proxies
+from proxies_taster.cache import ResultsCache
+from proxies_taster.journal import Journal
+from proxies_taster.loops import LOOPS
+from proxies_taster.loops import use_loop
+from proxies_taster.loops import current_loop
+from proxies_taster.distributed import Worker
+from proxies_taster.distributed import Coordinator
+from proxies_taster.writer import FORMATS
+from proxies_taster.writer import ResultsWriter
 
 # My logger
 from proxies_taster.proxies_parser_logger import setting_logging
@@ -32,6 +50,7 @@ from proxies_taster.proxies_parser_logger import setting_logging
 args = []
 bars: dict = {}
 worked_proxies: list = []
+writers: list = []
 
 
 def country_filter(countries: list[str]):
@@ -73,6 +92,66 @@ def status_codes_filter(codes: list[int]):
     return filt
 
 
+def latency_filter(max_latency: Union[float, None]):
+    """
+    Фильтр по времени проверки прокси
+
+    :param max_latency: Максимальное общее время
+        проверки в секундах (None - без ограничения)
+    :type max_latency: Union[float, None]
+
+    :return: Функция-фильтр
+    :rtype: Callable[WorkedProxy, bool]
+    """
+    def filt(proxy: WorkedProxy):
+        if max_latency is None:
+            return True
+
+        if not proxy.timings or proxy.timings.total is None:
+            return False
+
+        return proxy.timings.total <= max_latency
+
+    return filt
+
+
+def latency_key(proxy: WorkedProxy) -> float:
+    """
+    Ключ сортировки прокси по скорости
+    (прокси без замеров - в конце)
+
+    :param proxy: Рабочий прокси
+    :type proxy: WorkedProxy
+
+    :return: Общее время проверки
+    :rtype: float
+    """
+    if not proxy.timings or proxy.timings.total is None:
+        return float('inf')
+    return proxy.timings.total
+
+
+def proxy_filter(args):
+    """
+    Общий фильтр прокси по
+    аргументам --countries,
+    --status-codes и --max-latency
+
+    :return: Функция-фильтр
+    :rtype: Callable[WorkedProxy, bool]
+    """
+    filters = (
+        country_filter(args.countries),
+        status_codes_filter(args.status_codes),
+        latency_filter(args.max_latency)
+    )
+
+    def filt(proxy: WorkedProxy):
+        return all(check(proxy) for check in filters)
+
+    return filt
+
+
 def string_cast(proxy: WorkedProxy) -> str:
     """
     Преобразовывает рабочий прокси
@@ -88,17 +167,17 @@ def string_cast(proxy: WorkedProxy) -> str:
     return f"{proxy.status} {proxy.url} {proxy.country}"
 
 
-def parse_proxies(proxies: str) -> list[str]:
+def parse_proxies(proxies: str) -> Iterator[str]:
     """
     Парсим список прокси
 
     :param proxies: Получаем прокси, разделенные
-        переводом строки или пробелом
+        переводом строки, пробелом или запятой
     :type proxies: str
 
-    :return: Возвращает распаршенный
-        список прокси
-    :rtype: list[str]
+    :return: Возвращает генератор
+        уникальных прокси
+    :rtype: Iterator[str]
 
     **Пример работы**
 
@@ -106,16 +185,49 @@ def parse_proxies(proxies: str) -> list[str]:
 
         proxies = parse_proxies('72.195.34.59:4145 43.248.27.8:4646')
     """
-    proxies = proxies.strip().split("\n")
-    return list(
-        set(
-            sum(
-                [proxy.split(
-                    ',' if ',' in proxy else ' '
-                ) for proxy in proxies], []
-            )
+    return iter_proxies(io.StringIO(proxies))
+
+
+def workers_type(workers: str) -> Union[int, str]:
+    """
+    Тип аргументов --workers и
+    --processes: число или 'auto'
+
+    :param workers: Значение аргумента
+    :type workers: str
+
+    :return: Количество "воркеров" или 'auto'
+    :rtype: Union[int, str]
+    """
+    if workers == 'auto':
+        return workers
+
+    try:
+        return int(workers)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid value: '{workers}' (integer or auto)"
         )
-    )
+
+
+def resolve_type(value: str) -> tuple[str, str]:
+    """
+    Тип аргумента --resolve: HOST=IP
+
+    :param value: Значение аргумента
+    :type value: str
+
+    :return: Хост и адрес
+    :rtype: tuple[str, str]
+    """
+    host, _, address = value.partition('=')
+    try:
+        ipaddress.ip_address(address)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid resolve value: '{value}' (HOST=IP)"
+        )
+    return host, address
 
 
 def init_parser():
@@ -157,15 +269,224 @@ def init_parser():
         help="Добавить полученный результат в конец переданного файла"
     )
 
+    # Формат файлов --out и --append
+    parser.add_argument(
+        "--format",
+        "-f",
+        choices=FORMATS,
+        help="Формат файлов --out и --append: plain - строка на прокси, jsonl - json со всеми полями, csv - таблица",
+        default='plain'
+    )
+
     # Количество асинхронных запросов
     parser.add_argument(
         "--workers",
         "-w",
-        type=int,
-        help="Количество \"воркеров\" - асинхронных запросов",
+        type=workers_type,
+        help="Количество \"воркеров\" - асинхронных запросов, либо auto - максимальное безопасное количество по лимиту открытых файлов",
         default=200
     )
 
+    # Адаптивное количество асинхронных запросов
+    parser.add_argument(
+        "--adaptive",
+        help="Менять количество \"воркеров\" во время работы (--workers - начальное значение) и уменьшать его при нехватке ресурсов вместо остановки",
+        action='store_true',
+        default=False
+    )
+
+    # Максимальное количество асинхронных
+    # запросов при --adaptive
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Максимальное количество \"воркеров\" при --adaptive",
+        default=10000
+    )
+
+    # Количество процессов
+    parser.add_argument(
+        "--processes",
+        "-P",
+        type=workers_type,
+        help="Количество процессов, между которыми делятся прокси (--workers - в каждом процессе), либо auto - по количеству ядер",
+        default=1
+    )
+
+    # Реализация event loop
+    parser.add_argument(
+        "--loop",
+        choices=LOOPS,
+        help="Реализация event loop: uvloop (pip install uvloop), asyncio или auto - uvloop, если он установлен",
+        default='auto'
+    )
+
+    # Распределенная проверка
+    parser.add_argument(
+        "--coordinator",
+        type=str,
+        metavar="ADDRESS",
+        help="Раздавать прокси пачками \"воркерам\" (--worker) и собирать рабочие прокси; адрес host:port или unix:/path/to.sock"
+    )
+    parser.add_argument(
+        "--worker",
+        type=str,
+        metavar="ADDRESS",
+        help="Проверять прокси, получаемые от координатора (--coordinator) по адресу host:port или unix:/path/to.sock (вместо --processes запускается несколько \"воркеров\")"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Количество прокси в одной пачке при --coordinator",
+        default=1000
+    )
+    parser.add_argument(
+        "--lease",
+        type=float,
+        help="Через сколько секунд без ответа \"воркера\" его пачка выдается заново (при --coordinator)",
+        default=60
+    )
+
+    # Сервер для проверки прокси
+    parser.add_argument(
+        "--judge",
+        "-j",
+        type=str,
+        help="Адрес сервера (\"судьи\"), через запрос к которому проверяются прокси, например свой: python -m proxies_taster.judge (по-умолчанию https://ipinfo.io/json)"
+    )
+    parser.add_argument(
+        "--max-body",
+        type=int,
+        help="Сколько байт ответа \"судьи\" читать не больше (0 - проверять только код ответа, без ip и страны)",
+        default=1 << 16
+    )
+
+    # Ограничения времени этапов проверки
+    parser.add_argument(
+        "--timeout",
+        "-t",
+        type=float,
+        help="Максимальное время всей проверки одного протокола прокси (в секундах)",
+        default=10
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        help="Время ожидания TCP подключения к прокси (в секундах)"
+    )
+    parser.add_argument(
+        "--handshake-timeout",
+        type=float,
+        help="Время ожидания рукопожатия с прокси: согласования SOCKS или запроса CONNECT (в секундах)"
+    )
+    parser.add_argument(
+        "--tls-timeout",
+        type=float,
+        help="Время ожидания TLS рукопожатия с \"судьей\" через прокси (в секундах)"
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        help="Время ожидания первого байта ответа и каждой следующей части тела (в секундах)"
+    )
+
+    # Проверять протоколы одновременно
+    parser.add_argument(
+        "--race",
+        "-r",
+        help="Проверять все протоколы прокси одновременно, а не по очереди",
+        action='store_true',
+        default=False
+    )
+
+    # Определять протокол рукопожатием
+    parser.add_argument(
+        "--probe",
+        help="Определять протокол прокси коротким рукопожатием и проверять только его",
+        action='store_true',
+        default=False
+    )
+
+    # Предварительная проверка TCP подключения
+    parser.add_argument(
+        "--prefilter",
+        help="Отбрасывать прокси, не принимающие TCP соединения, до основной проверки",
+        action='store_true',
+        default=False
+    )
+
+    # Время ожидания предварительной проверки
+    parser.add_argument(
+        "--prefilter-timeout",
+        type=float,
+        help="Время ожидания TCP подключения при предварительной проверке (в секундах)",
+        default=1
+    )
+
+    # Количество одновременных подключений
+    # предварительной проверки
+    parser.add_argument(
+        "--prefilter-workers",
+        type=int,
+        help="Количество одновременных TCP подключений при предварительной проверке",
+        default=2000
+    )
+
+    # Хранилище результатов проверок
+    parser.add_argument(
+        "--cache",
+        type=str,
+        help="Путь до файла (SQLite) с результатами прошлых проверок; недавно проверенные прокси не проверяются заново"
+    )
+
+    # Время актуальности результатов
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        help="Сколько секунд результат проверки из --cache считается актуальным",
+        default=3600
+    )
+
+    # Журнал проверки
+    parser.add_argument(
+        "--journal",
+        type=str,
+        help="Путь до файла журнала, в который записывается каждый проверенный прокси (для --resume)"
+    )
+    parser.add_argument(
+        "--resume",
+        help="Продолжить прерванную проверку по --journal: проверенные прокси пропускаются, а найденные рабочие восстанавливаются",
+        action='store_true',
+        default=False
+    )
+    parser.add_argument(
+        "--overwrite-journal",
+        help="Начать заново непустой --journal (без этого журнал прерванной проверки не перезаписывается)",
+        action='store_true',
+        default=False
+    )
+
+    # Кеш DNS
+    parser.add_argument(
+        "--dns-ttl",
+        type=float,
+        help="Сколько секунд хранить адреса в общем кеше DNS",
+        default=60
+    )
+    parser.add_argument(
+        "--pin-judge",
+        help="Резолвить хост \"судьи\" один раз за всю проверку",
+        action='store_true',
+        default=False
+    )
+    parser.add_argument(
+        "--resolve",
+        nargs='+',
+        type=resolve_type,
+        help="Заранее известные адреса хостов (HOST=IP), например ipinfo.io=34.117.59.81",
+        default=[]
+    )
+
     # По каким протоколам фильтровать
     parser.add_argument(
         "--protocols",
@@ -197,6 +518,23 @@ def init_parser():
         default=[]
     )
 
+    # Максимальное время проверки
+    parser.add_argument(
+        "--max-latency",
+        "-ml",
+        type=float,
+        help="Фильтр по времени проверки прокси: отбрасывать прокси, ответившие медленнее (в секундах)"
+    )
+
+    # Сортировать по скорости
+    parser.add_argument(
+        "--sort",
+        "-s",
+        help="Сортировать прокси по скорости (сначала самые быстрые)",
+        action='store_true',
+        default=False
+    )
+
     # Файл с конфигом
     parser.add_argument(
         "--logconfig",
@@ -304,47 +642,69 @@ def query_yes_no(question: str, default: str|None = "yes") -> bool:
             print("Please response yes/no/y/n")
 
 
+def open_writers(args) -> list[ResultsWriter]:
+    """
+    Открыть файлы --out и --append
+    для записи рабочих прокси
+
+    :return: Открытые файлы
+    :rtype: list[ResultsWriter]
+    """
+    return [
+        ResultsWriter(path, args.format, append, string_cast)
+        for path, append in ((args.out, False), (args.append, True))
+        if path
+    ]
+
+
 def save_proxies(
         args,
         worked_proxies: list,
         interrupt: bool = False
 ) -> list[str]:
     """
-    Получить обработанные прокси
+    Вывести обработанные прокси и
+    закончить запись файлов --out
+    и --append
+
+    Без --sort прокси записываются в
+    файлы по мере проверки, а здесь
+    файлы только закрываются (при
+    прерывании - с подтверждением,
+    иначе запись отменяется)
 
     :return: Обработанные строки прокси
     :rtype: list[str]
     """
-    proxies = list(
-        map(
-            string_cast, filter(
-                status_codes_filter(args.status_codes), filter(
-                    country_filter(args.countries), worked_proxies
-                )
-            )
-        )
-    );
+    proxies = filter(proxy_filter(args), worked_proxies)
+
+    # Сортируем по скорости
+    if args.sort:
+        proxies = sorted(proxies, key=latency_key)
+    proxies = list(proxies)
 
     # Выводим список полученных прокси
     for proxy in proxies:
-        print(proxy)
+        print(string_cast(proxy))
 
-    # Сохраняем в файл
-    if args.out:
-        if not interrupt or query_yes_no(
-            f"Save proxies into file {args.out}?"
-        ):
-            with open(args.out, "w", encoding="utf-8") as out:
-                out.write("\n".join(proxies))
+    # Отсортированные прокси
+    # записываются только в конце
+    if not writers:
+        writers.extend(open_writers(args))
+        for writer in writers:
+            for proxy in proxies:
+                writer.write(proxy)
 
-    # Добавляем в файл
-    if args.append:
+    for writer in writers:
         if not interrupt or query_yes_no(
-            f"Append passed proxies into file {args.append}?"
+            f"Append passed proxies into file {writer.path}?"
+            if writer.append else f"Save proxies into file {writer.path}?"
         ):
-            with open(args.append, "a", encoding="UTF-8") as append:
-                for proxy in proxies:
-                    append.write("\n" + proxy)
+            writer.close()
+        else:
+            writer.abort()
+
+    return list(map(string_cast, proxies))
 
 
 async def main():
@@ -370,17 +730,35 @@ async def main():
     # Получаем аргументы
     args = parser.parse_args()
 
-    # Получаем возможный ввод из pipeline
-    args.proxies = args.proxies if sys.stdin.isatty() \
-        else ' '.join(sys.stdin.read().splitlines()).strip()
+    if args.resume and not args.journal:
+        parser.error("Argument --resume requires --journal")
+    if args.overwrite_journal and not args.journal:
+        parser.error("Argument --overwrite-journal requires --journal")
+    if args.overwrite_journal and args.resume:
+        parser.error("Arguments --overwrite-journal and --resume are exclusive")
+    if args.journal and args.worker:
+        parser.error("Argument --journal is used by the coordinator, not --worker")
+
+    # "Воркер" проверяет пачки в одном event loop,
+    # а координатор сам прокси не проверяет
+    if args.processes != 1 and (args.worker or args.coordinator):
+        parser.error(
+            "Argument --processes cannot be used with --worker or "
+            "--coordinator (start one --worker per process instead)"
+        )
 
-    if not args.proxies:
+    # Получаем прокси по мере чтения: из
+    # pipeline, из файла (если файл) или
+    # из самого аргумента ("воркер" получает
+    # прокси от координатора)
+    if args.worker:
+        proxies = []
+    elif not sys.stdin.isatty():
+        proxies = iter_proxies(sys.stdin)
+    elif not args.proxies:
         parser.error("Argument 'proxies' is positional argument")
-
-    # Получаем прокси из файла (если файл)
-    if os.path.exists(args.proxies):
-        with open(args.proxies, "r", encoding="UTF-8") as proxies_file:
-            proxies = parse_proxies(proxies_file.read())
+    elif os.path.exists(args.proxies):
+        proxies = read_proxies(args.proxies)
     else:
         proxies = parse_proxies(args.proxies)
 
@@ -397,6 +775,25 @@ async def main():
 
     FLOGGER, DLOGGER = setting_logging(args.logconfig, **logkwargs)
     DLOGGER.debug(f"Parsed args: {args}")
+    DLOGGER.debug(f"Event loop: {current_loop()}")
+
+    # Без сортировки рабочие прокси
+    # записываются по мере проверки
+    # (у "воркера" их записывает координатор)
+    if not args.sort and not args.worker:
+        try:
+            writers.extend(open_writers(args))
+        except OSError as err:
+            parser.error(str(err))
+
+    keep = proxy_filter(args)
+
+    def found(proxy: WorkedProxy):
+        worked_proxies.append(proxy)
+        bars['success'].update()
+        if keep(proxy):
+            for writer in writers:
+                writer.write(proxy)
 
     bars = {
         'success': tqdm(
@@ -404,24 +801,106 @@ async def main():
             desc='Success'
         ),
         'process': tqdm(
-            total=len(proxies),
             dynamic_ncols=True,
             desc='Process'
         ),
     }
 
+    # Журнал проверки и рабочие
+    # прокси прерванной проверки
+    journal = None
+    if args.journal:
+        try:
+            journal = Journal(
+                args.journal, args.resume, args.overwrite_journal
+            )
+        except (OSError, ValueError) as err:
+            for writer in writers:
+                writer.abort()
+            for bar in bars.values():
+                bar.close()
+            parser.error(f"Journal {args.journal}: {err}")
+
+        DLOGGER.info(
+            f"Journal: {len(journal.checked)} checked, "
+            f"{len(journal.worked)} worked"
+        )
+        for proxy in journal.worked.values():
+            found(proxy)
+
+    # Координатор только раздает прокси
+    # и собирает рабочие
+    if args.coordinator:
+        coordinator = Coordinator(
+            proxies, args.batch_size, args.lease, journal
+        )
+        coordinator.emitter.on(
+            Events.progress.value, lambda event: bars['process'].update(
+                event.checked - bars['process'].n
+            )
+        )
+
+        DLOGGER.info(f"Coordinator on {args.coordinator}")
+        try:
+            async for worked in coordinator.serve(args.coordinator):
+                DLOGGER.info(f"Proxy work {worked.proxy}")
+                found(worked)
+        except (OSError, ValueError) as err:
+            for bar in bars.values():
+                bar.close()
+            parser.error(str(err))
+        finally:
+            if journal:
+                journal.close()
+
+        for bar in bars.values():
+            bar.close()
+        return
+
     DLOGGER.info('Initialization taster')
     # Объект проверяльщика прокси
     taster = ProxiesTaster(proxies)
 
-    # Его настройки
+    # Его настройки (предварительная проверка
+    # до "воркеров", так как её подключения
+    # учитываются при --workers auto)
+    taster.set_prefilter(
+        args.prefilter,
+        args.prefilter_timeout,
+        args.prefilter_workers
+    )
     taster.set_workers(args.workers)
+    DLOGGER.debug(f"Workers: {taster.workers}")
     taster.set_protocols(
         [
             Protocol(protocol)
             for protocol in args.protocols
         ]
     )
+    if args.adaptive:
+        taster.set_adaptive(True, maximum=args.max_workers)
+    taster.set_judge(
+        Judge.from_url(args.judge, limit=args.max_body)
+        if args.judge else Judge(limit=args.max_body)
+    )
+    taster.set_timeouts(
+        connect=args.connect_timeout,
+        handshake=args.handshake_timeout,
+        tls=args.tls_timeout,
+        read=args.read_timeout,
+        total=args.timeout
+    )
+    taster.set_racing(args.race)
+    taster.set_probing(args.probe)
+    taster.set_processes(args.processes)
+    if args.cache:
+        taster.set_cache(ResultsCache(args.cache, args.cache_ttl))
+
+    hosts: dict[str, list[str]] = {}
+    for host, address in args.resolve:
+        hosts.setdefault(host, []).append(address)
+    taster.set_resolver(args.dns_ttl, args.pin_judge, hosts)
+    taster.set_journal(journal)
 
     # Установка обработчиков
     taster.on(
@@ -437,8 +916,7 @@ async def main():
         Events.check_success, lambda event: [
             DLOGGER.info(f"Proxy work {event.proxy.proxy}"),
             DLOGGER.debug(f"Work proxy data {event.proxy}"),
-            worked_proxies.append(event.proxy),
-            bars['success'].update()
+            found(event.proxy)
         ]
     )
 
@@ -451,14 +929,33 @@ async def main():
         )
     )
 
-    taster.on(
-        Events.check_end, lambda event: bars['process'].update()
-    )
+    # В нескольких процессах приходят только
+    # общие счетчики проверенных прокси
+    if taster.processes > 1 and not args.worker:
+        taster.on(
+            Events.progress, lambda event: bars['process'].update(
+                event.checked - bars['process'].n
+            )
+        )
+    else:
+        taster.on(
+            Events.check_end, lambda event: bars['process'].update()
+        )
 
     # Получаем прокси, фильтруем их
     # и преобразуем в строки
     try:
-        await taster.run()
+        if args.worker:
+            DLOGGER.info(f"Worker of {args.worker}")
+            await Worker(taster, args.worker).run()
+        else:
+            await taster.run()
+    except (OSError, ValueError) as err:
+        if not args.worker:
+            raise
+        for bar in bars.values():
+            bar.close()
+        parser.error(f"Coordinator {args.worker}: {err}")
     except TooManyOpenFilesError:
         for bar in bars.values():
             bar.close()
@@ -467,8 +964,15 @@ async def main():
             + '(too many open files). The number of file ' \
             + 'descriptors should be slightly larger than ' \
             + 'the quantity of "Workers"; ' \
-            + f"installed workers: {args.workers}"
+            + f"installed workers: {taster.workers}. " \
+            + 'Use "--workers auto" or "--adaptive" to pick ' \
+            + 'a safe quantity automatically'
         )
+    finally:
+        if taster.cache:
+            taster.cache.close()
+        if journal:
+            journal.close()
 
     for bar in bars.values():
         bar.close()
@@ -483,17 +987,30 @@ if __name__ == "__main__":
     #     "proxes-taster": find_spec('proxies-taster')
     # }
 
+    # Event loop выбирается до запуска
+    parser = init_parser()
+    try:
+        use_loop(parser.parse_args().loop)
+    except ImportError as err:
+        parser.error(str(err))
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         for bar in bars.values():
             bar.close()
 
-        if args and worked_proxies:
+        if args and not args.worker and worked_proxies:
             try:
                 save_proxies(args, worked_proxies, True)
             except KeyboardInterrupt:
                 pass
+
+        # Несохраненные файлы не меняются
+        for writer in writers:
+            writer.abort()
         exit('Work is suspended. Bye-bye')
 
-    save_proxies(args, worked_proxies)
+    # Рабочие прокси "воркера" сохраняет координатор
+    if not args.worker:
+        save_proxies(args, worked_proxies)
@@ -0,0 +1,272 @@
+# Typing
+from typing import Union
+
+# Time
+import time
+
+# Sqlite
+import sqlite3
+
+# Dataclass
+from dataclasses import dataclass
+
+# Types
+from .types import Protocol
+
+
+@dataclass
+class CacheRecord:
+    """
+    Последний результат
+    проверки прокси
+
+    :param proxy: Нормализованный прокси
+    :type proxy: str
+
+    :param requested: Протокол, по которому
+        проверялся прокси (None - определялся
+        перебором)
+    :type requested: Union[Protocol, None]
+
+    :param alive: Был ли прокси рабочим
+    :type alive: bool
+
+    :param protocol: Определенный протокол
+    :type protocol: Union[Protocol, None]
+
+    :param latency: Время проверки в секундах
+    :type latency: Union[float, None]
+
+    :param checked: Время проверки (unix time)
+    :type checked: float
+    """
+    proxy: str
+    requested: Union[Protocol, None]
+    alive: bool
+    protocol: Union[Protocol, None]
+    latency: Union[float, None]
+    checked: float
+
+
+class ResultsCache:
+    """
+    Хранилище результатов проверок
+    на диске (SQLite), чтобы не проверять
+    заново недавно проверенные прокси
+
+    Недавно не работавшие прокси
+    пропускаются, а для недавно
+    работавших сразу проверяется
+    известный протокол. Результаты
+    хранятся отдельно для каждого
+    протокола, по которому проверялся
+    прокси (нерабочий как SOCKS5 прокси
+    может работать как HTTP). Записи
+    сохраняются пачками
+
+    .. code-block:: python
+
+        cache = ResultsCache('results.sqlite', ttl=3600)
+        taster.set_cache(cache)
+
+        await taster.run()
+        cache.close()
+
+    :param path: Путь до файла базы данных
+    :type path: str
+
+    :param ttl: Сколько секунд результат
+        рабочего прокси считается актуальным
+    :type ttl: float
+
+    :param dead_ttl: Сколько секунд результат
+        нерабочего прокси считается актуальным
+        (по-умолчанию как `ttl`)
+    :type dead_ttl: Union[float, None]
+
+    :param batch: Количество записей, после
+        которого они сохраняются в базу
+    :type batch: int
+    """
+    def __init__(
+            self,
+            path: str,
+            ttl: float = 3600,
+            dead_ttl: Union[float, None] = None,
+            batch: int = 1000
+    ):
+        """
+        Иницилизация хранилища
+
+        :param path: Путь до файла базы данных
+        :type path: str
+
+        :param ttl: Время актуальности рабочего прокси
+        :type ttl: float
+
+        :param dead_ttl: Время актуальности нерабочего прокси
+        :type dead_ttl: Union[float, None]
+
+        :param batch: Размер пачки сохраняемых записей
+        :type batch: int
+        """
+        self.path = path
+        self.ttl = ttl
+        self.dead_ttl = ttl if dead_ttl is None else dead_ttl
+        self.batch = batch if batch > 0 else 1
+
+        # Еще не сохраненные записи
+        self.pending: list[tuple] = []
+
+        # Ожидание записи других процессов
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            '''
+            CREATE TABLE IF NOT EXISTS proxies (
+                requested TEXT NOT NULL,
+                proxy TEXT NOT NULL,
+                alive INTEGER NOT NULL,
+                protocol TEXT,
+                latency REAL,
+                checked REAL NOT NULL,
+                PRIMARY KEY (requested, proxy)
+            )
+            '''
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def key(requested: Union[Protocol, None]) -> str:
+        """
+        Значение протокола проверки в базе
+
+        :param requested: Протокол проверки
+        :type requested: Union[Protocol, None]
+
+        :return: Протокол, либо 'auto'
+        :rtype: str
+        """
+        return requested.value if requested else 'auto'
+
+    def get(
+            self,
+            proxy: str,
+            requested: Union[Protocol, None] = None
+    ) -> Union[CacheRecord, None]:
+        """
+        Получить актуальный результат
+        проверки прокси
+
+        :param proxy: Нормализованный прокси
+        :type proxy: str
+
+        :param requested: Протокол, по которому
+            проверяется прокси (None - перебором)
+        :type requested: Union[Protocol, None]
+
+        :return: Запись, либо None, если прокси
+            не проверялся или результат устарел
+        :rtype: Union[CacheRecord, None]
+        """
+        row = self.connection.execute(
+            'SELECT alive, protocol, latency, checked '
+            'FROM proxies WHERE requested = ? AND proxy = ?',
+            (self.key(requested), proxy)
+        ).fetchone()
+        if row is None:
+            return None
+
+        alive, protocol, latency, checked = row
+        if time.time() - checked > (self.ttl if alive else self.dead_ttl):
+            return None
+
+        return CacheRecord(
+            proxy=proxy,
+            requested=requested,
+            alive=bool(alive),
+            protocol=Protocol(protocol) if protocol else None,
+            latency=latency,
+            checked=checked
+        )
+
+    def put(
+            self,
+            proxy: str,
+            alive: bool,
+            protocol: Union[Protocol, None] = None,
+            latency: Union[float, None] = None,
+            requested: Union[Protocol, None] = None
+    ):
+        """
+        Записать результат проверки
+        (сохраняется в базу пачками)
+
+        :param proxy: Нормализованный прокси
+        :type proxy: str
+
+        :param alive: Рабочий ли прокси
+        :type alive: bool
+
+        :param protocol: Определенный протокол
+        :type protocol: Union[Protocol, None]
+
+        :param latency: Время проверки в секундах
+        :type latency: Union[float, None]
+
+        :param requested: Протокол, по которому
+            проверялся прокси (None - перебором)
+        :type requested: Union[Protocol, None]
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.pending.append(
+            (
+                self.key(requested),
+                proxy,
+                int(alive),
+                protocol.value if protocol else None,
+                latency,
+                time.time()
+            )
+        )
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        """
+        Сохранить накопленные записи
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if not self.pending:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO proxies '
+                '(requested, proxy, alive, protocol, latency, checked) '
+                'VALUES (?, ?, ?, ?, ?, ?)', self.pending
+            )
+        self.pending = []
+
+    def close(self):
+        """
+        Сохранить накопленные записи
+        и закрыть базу
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.flush()
+        self.connection.close()
+
+    def __reduce__(self):
+        # В другом процессе открывается
+        # свое подключение к той же базе
+        return (
+            type(self), (self.path, self.ttl, self.dead_ttl, self.batch)
+        )
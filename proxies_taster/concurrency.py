@@ -0,0 +1,307 @@
+# Typing
+from typing import Union
+
+# Errno
+import errno
+
+# Collections
+from collections import deque
+
+# Asyncio
+import asyncio
+
+# Events
+from .events_data import Event
+
+# Exceptions
+from .exceptions import TooManyOpenFilesError
+
+
+RESOURCE_ERRORS = (
+    errno.EMFILE,
+    errno.ENFILE,
+    errno.ENOBUFS,
+    errno.EADDRNOTAVAIL
+)
+"""Коды ошибок, означающие нехватку
+ресурсов (дескрипторов, портов, буферов)"""
+
+
+class AdaptiveLimiter:
+    """
+    Замена asyncio.Semaphore, которая
+    меняет количество одновременных
+    проверок во время работы (AIMD):
+    каждое "окно" проверок без признаков
+    перегрузки увеличивает лимит на `step`,
+    а перегрузка уменьшает его в `factor` раз
+
+    Признаки перегрузки: нехватка ресурсов
+    (Too many open files и т.д.), рост доли
+    ошибок относительно обычной и задержка
+    event loop
+
+    .. code-block:: python
+
+        limiter = AdaptiveLimiter(200, maximum=5000)
+
+        async with limiter:
+            ...
+
+    :param limit: Начальный лимит
+    :type limit: int
+
+    :param minimum: Минимальный лимит
+    :type minimum: int
+
+    :param maximum: Максимальный лимит
+    :type maximum: int
+
+    :param step: На сколько увеличивать лимит
+    :type step: int
+
+    :param factor: Во сколько раз уменьшать лимит
+    :type factor: float
+
+    :param window: Количество проверок, после
+        которого принимается решение
+    :type window: int
+
+    :param tolerance: Допустимый рост доли ошибок
+        относительно обычной
+    :type tolerance: float
+
+    :param max_lag: Допустимая задержка event loop в секундах
+    :type max_lag: float
+
+    :param interval: Период замера задержки event loop
+        и минимальный интервал между уменьшениями лимита
+    :type interval: float
+
+    :param retries: Сколько раз повторять проверку
+        прокси при нехватке ресурсов
+    :type retries: int
+    """
+    def __init__(
+            self,
+            limit: int = 200,
+            minimum: int = 10,
+            maximum: int = 10000,
+            step: int = 10,
+            factor: float = 0.5,
+            window: int = 200,
+            tolerance: float = 0.1,
+            max_lag: float = 0.2,
+            interval: float = 0.5,
+            retries: int = 3
+    ):
+        """
+        Иницилизация лимитера
+
+        :param limit: Начальный лимит
+        :type limit: int
+        """
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = min(max(limit, self.minimum), self.maximum)
+        self.step = step
+        self.factor = factor
+        self.window = window
+        self.tolerance = tolerance
+        self.max_lag = max_lag
+        self.interval = interval
+        self.retries = retries
+
+        # Занятые места и ожидающие задачи
+        self.active = 0
+        self.waiters: deque = deque()
+
+        # Результаты текущего окна
+        self.successes = 0
+        self.errors = 0
+
+        # Обычная доля ошибок
+        self.baseline: Union[float, None] = None
+
+        # Задержка event loop
+        self.lag = 0.0
+        self.monitor: Union[asyncio.Task, None] = None
+
+        # Время последнего уменьшения лимита
+        self.decreased = float('-inf')
+
+    def set_limit(self, limit: int):
+        """
+        Установить текущий лимит
+
+        :param limit: Количество одновременных проверок
+        :type limit: int
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.limit = min(max(limit, self.minimum), self.maximum)
+        self.wake()
+
+    def locked(self) -> bool:
+        return self.active >= self.limit
+
+    async def acquire(self):
+        """
+        Занять место (ждет, пока
+        не освободится)
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if self.monitor is None:
+            self.monitor = asyncio.ensure_future(self.watch())
+
+        while self.locked():
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Передаем пробуждение следующей задаче
+                if waiter.done() and not waiter.cancelled():
+                    self.wake()
+                elif waiter in self.waiters:
+                    self.waiters.remove(waiter)
+                raise
+
+        self.active += 1
+
+    def release(self):
+        """
+        Освободить место
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.active -= 1
+        self.wake()
+
+    def wake(self):
+        """
+        Разбудить ожидающие задачи
+        по количеству свободных мест
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        free = self.limit - self.active
+        while free > 0 and self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+        if exc_type is not None and issubclass(
+                exc_type, TooManyOpenFilesError
+        ):
+            self.overload()
+
+    def observe(self, event: Event):
+        """
+        Учесть результат попытки проверки;
+        используется как обработчик событий
+        `except.success` и `except.error.skipped`
+
+        :param event: Данные события
+        :type event: Event
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        exception = getattr(event, 'exception', None)
+        if exception is None:
+            self.successes += 1
+        elif getattr(exception, 'errno', None) in RESOURCE_ERRORS:
+            self.overload()
+            return
+        else:
+            self.errors += 1
+
+        if self.successes + self.errors >= self.window:
+            self.adjust()
+
+    def adjust(self):
+        """
+        Изменить лимит по результатам
+        окна проверок
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        rate = self.errors / (self.successes + self.errors)
+        self.successes = self.errors = 0
+
+        if self.lag > self.max_lag or (
+                self.baseline is not None
+                and rate > self.baseline + self.tolerance
+        ):
+            self.decrease()
+            return
+
+        # Обновляем обычную долю ошибок
+        # только по "здоровым" окнам
+        self.baseline = rate if self.baseline is None \
+            else self.baseline * 0.9 + rate * 0.1
+
+        self.limit = min(self.limit + self.step, self.maximum)
+        self.wake()
+
+    def overload(self):
+        """
+        Нехватка ресурсов: уменьшить лимит
+        (не чаще одного раза за `interval`)
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.decrease()
+
+    def decrease(self):
+        """
+        Уменьшить лимит в `factor` раз
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        now = asyncio.get_running_loop().time()
+        if now - self.decreased < self.interval:
+            return
+
+        self.decreased = now
+        self.limit = max(int(self.limit * self.factor), self.minimum)
+
+    async def watch(self):
+        """
+        Замер задержки event loop
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = loop.time() - started - self.interval
+
+    async def close(self):
+        """
+        Остановить замер задержки event loop
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if self.monitor is not None:
+            self.monitor.cancel()
+            await asyncio.gather(self.monitor, return_exceptions=True)
+            self.monitor = None
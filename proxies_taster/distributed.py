@@ -0,0 +1,744 @@
+# Typing
+from typing import Union
+from typing import Iterable
+from typing import AsyncIterator
+
+# Standarts
+import json
+import time
+import itertools
+
+# Dataclass
+from dataclasses import field
+from dataclasses import dataclass
+
+# Collections
+from collections import deque
+
+# Asyncio
+import asyncio
+
+# Types
+from .types import WorkedProxy
+
+# Parser
+from .parser import proxy_string
+
+# Events
+from .events_data import Progress
+
+# Emitter
+from .emitter import Emitter
+
+# Journal
+from .journal import Journal
+
+
+LINE_LIMIT = 1 << 24
+"""Максимальный размер одного
+сообщения (строки json)"""
+
+WAIT_INTERVAL = 1
+"""Через сколько секунд "воркер" снова
+просит пачку, если свободных пока нет"""
+
+FLUSH_INTERVAL = 0.2
+"""Как часто "воркер" отправляет
+накопленные результаты (в секундах)"""
+
+CLOSE_TIMEOUT = 5
+"""Сколько координатор ждет отключения
+"воркеров" после окончания работы"""
+
+
+def parse_address(address: str) -> dict:
+    """
+    Разобрать адрес координатора:
+    `host:port` или `unix:/path/to.sock`
+
+    :param address: Адрес
+    :type address: str
+
+    :raises ValueError: Если адрес в неправильном формате
+
+    :return: Параметры для asyncio (host
+        и port, либо path)
+    :rtype: dict
+    """
+    if address.startswith('unix:'):
+        return {'path': address[len('unix:'):]}
+
+    host, separator, port = address.rpartition(':')
+    if not separator or not port.isdigit():
+        raise ValueError(
+            f"Invalid address '{address}' (host:port or unix:/path)"
+        )
+    return {'host': host or '0.0.0.0', 'port': int(port)}
+
+
+async def open_connection(address: str) -> tuple[
+    asyncio.StreamReader, asyncio.StreamWriter
+]:
+    """
+    Подключиться к координатору
+    по TCP или Unix сокету
+
+    :param address: Адрес координатора
+    :type address: str
+
+    :return: Соединение
+    :rtype: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+    """
+    options = parse_address(address)
+    if 'path' in options:
+        return await asyncio.open_unix_connection(
+            options['path'], limit=LINE_LIMIT
+        )
+    return await asyncio.open_connection(
+        options['host'], options['port'], limit=LINE_LIMIT
+    )
+
+
+def send(writer: asyncio.StreamWriter, message: dict):
+    """
+    Отправить сообщение (строку json)
+
+    :param writer: Соединение
+    :type writer: asyncio.StreamWriter
+
+    :param message: Сообщение
+    :type message: dict
+    """
+    writer.write(json.dumps(message).encode() + b'\n')
+
+
+@dataclass
+class Batch:
+    """
+    Пачка прокси, выданная "воркерам"
+
+    :param id: Номер пачки
+    :type id: int
+
+    :param proxies: Прокси
+    :type proxies: list[str]
+
+    :param holders: "Воркеры", которым выдана
+        пачка, и окончание их аренды
+    :type holders: dict[asyncio.StreamWriter, float]
+
+    :param issued: Когда пачка была выдана впервые
+    :type issued: float
+
+    :param worked: Уже полученные рабочие прокси
+        по номеру в пачке (пачка может
+        проверяться дважды)
+    :type worked: dict[int, WorkedProxy]
+    """
+    id: int
+    proxies: list[str]
+    holders: dict = field(default_factory=dict)
+    issued: float = 0
+    worked: dict = field(default_factory=dict)
+
+
+class Coordinator:
+    """
+    Координатор распределенной проверки:
+    раздает прокси пачками "воркерам"
+    (`Worker`) по TCP или Unix сокету
+    и собирает рабочие прокси
+
+    Пачка выдается в аренду на `lease`
+    секунд, которую "воркер" продлевает,
+    пока проверяет её. Пачки отключившихся
+    или не продлевающих аренду "воркеров"
+    выдаются заново. Когда новых пачек не
+    осталось, освободившийся "воркер"
+    забирает копию самой давно выданной
+    пачки, а тот, кто проверил её вторым,
+    получает отмену
+
+    .. code-block:: python
+
+        coordinator = Coordinator(read_proxies('proxies.txt'))
+        async for worked in coordinator.serve('0.0.0.0:7500'):
+            print(worked.url)
+
+    :param proxies: Прокси (любой итерируемый объект)
+    :type proxies: Iterable
+
+    :param batch: Размер пачки
+    :type batch: int
+
+    :param lease: Время аренды пачки (в секундах)
+    :type lease: float
+
+    :param journal: Журнал проверки: проверенные
+        прокси из него не раздаются, а
+        проверенные пачки дописываются в него
+    :type journal: Union[Journal, None]
+    """
+    def __init__(
+            self,
+            proxies: Iterable,
+            batch: int = 1000,
+            lease: float = 60,
+            journal: Union[Journal, None] = None
+    ):
+        """
+        Иницилизация координатора
+
+        :param proxies: Прокси
+        :type proxies: Iterable
+
+        :param batch: Размер пачки
+        :type batch: int
+
+        :param lease: Время аренды пачки
+        :type lease: float
+
+        :param journal: Журнал проверки
+        :type journal: Union[Journal, None]
+        """
+        self.journal = journal
+        self.proxies = iter(journal.pending(proxies) if journal else proxies)
+        self.batch = batch if batch > 0 else 1
+        self.lease = lease
+
+        # Пачки, которые нужно выдать заново
+        self.queue: deque[Batch] = deque()
+
+        # Выданные и еще не проверенные пачки
+        self.leased: dict[int, Batch] = {}
+
+        self.ids = itertools.count()
+        self.exhausted = False
+        self.reading = asyncio.Lock()
+
+        self.checked = 0
+        self.worked = 0
+        self.results: asyncio.Queue = asyncio.Queue()
+        self.finished = asyncio.Event()
+        self.workers: set[asyncio.StreamWriter] = set()
+        self.handlers: set[asyncio.Task] = set()
+
+        # Events
+        self.emitter = Emitter()
+
+    async def read(self) -> Union[Batch, None]:
+        """
+        Прочитать следующую пачку прокси
+        (в отдельном потоке, так как
+        чтение может блокировать)
+
+        :return: Пачка, либо None, если прокси закончились
+        :rtype: Union[Batch, None]
+        """
+        async with self.reading:
+            if self.exhausted:
+                return None
+
+            proxies = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: [
+                    proxy_string(proxy)
+                    for proxy in itertools.islice(self.proxies, self.batch)
+                ]
+            )
+            if not proxies:
+                self.exhausted = True
+                return None
+            return Batch(next(self.ids), proxies)
+
+    async def issue(self, writer: asyncio.StreamWriter) -> Union[Batch, None]:
+        """
+        Выбрать пачку для "воркера": выданную
+        заново, новую, либо копию самой
+        давно выданной чужой пачки
+
+        :param writer: Соединение "воркера"
+        :type writer: asyncio.StreamWriter
+
+        :return: Пачка, либо None, если выдать нечего
+        :rtype: Union[Batch, None]
+        """
+        batch = self.queue.popleft() if self.queue else await self.read()
+
+        if batch is None:
+            # Прокси закончились уже после
+            # проверки последней пачки
+            if self.exhausted and not self.queue and not self.leased:
+                self.finished.set()
+                return None
+
+            candidates = [
+                batch for batch in self.leased.values()
+                if len(batch.holders) == 1 and writer not in batch.holders
+            ]
+            if not candidates:
+                return None
+            batch = min(candidates, key=lambda batch: batch.issued)
+
+        if not batch.issued:
+            batch.issued = time.monotonic()
+        batch.holders[writer] = time.monotonic() + self.lease
+        self.leased[batch.id] = batch
+        return batch
+
+    def release(self, writer: asyncio.StreamWriter, batch: Batch):
+        """
+        Забрать пачку у "воркера"; если
+        её больше никто не проверяет -
+        выдать заново
+
+        :param writer: Соединение "воркера"
+        :type writer: asyncio.StreamWriter
+
+        :param batch: Пачка
+        :type batch: Batch
+        """
+        batch.holders.pop(writer, None)
+        if not batch.holders and batch.id in self.leased:
+            del self.leased[batch.id]
+            self.queue.appendleft(batch)
+
+    def complete(self, writer: asyncio.StreamWriter, batch_id: int):
+        """
+        Пачка проверена: остальным
+        "воркерам" с этой пачкой
+        отправляется отмена
+
+        :param writer: Соединение "воркера"
+        :type writer: asyncio.StreamWriter
+
+        :param batch_id: Номер пачки
+        :type batch_id: int
+        """
+        batch = self.leased.pop(batch_id, None)
+        if batch is None:
+            return
+
+        for holder in batch.holders:
+            if holder is not writer:
+                send(holder, {'type': 'cancel', 'batch': batch_id})
+
+        if self.journal:
+            for index, proxy in enumerate(batch.proxies):
+                self.journal.record(proxy, batch.worked.get(index, False))
+
+        self.checked += len(batch.proxies)
+        self.progress()
+
+        if self.exhausted and not self.queue and not self.leased:
+            self.finished.set()
+
+    def result(self, batch_id: int, index: int, data: dict):
+        """
+        Рабочий прокси от "воркера"
+        (повторы из копий пачки
+        отбрасываются)
+
+        :param batch_id: Номер пачки
+        :type batch_id: int
+
+        :param index: Номер прокси в пачке
+        :type index: int
+
+        :param data: Рабочий прокси (`WorkedProxy.to_dict`)
+        :type data: dict
+        """
+        batch = self.leased.get(batch_id)
+        if batch is None or index in batch.worked:
+            return
+
+        worked = batch.worked[index] = WorkedProxy.from_dict(data)
+        self.worked += 1
+        self.results.put_nowait(worked)
+
+    def progress(self):
+        """
+        Событие со счетчиками
+        проверенных и рабочих прокси
+        """
+        if self.emitter.listens('run.progress'):
+            self.emitter.emit(
+                'run.progress', Progress(
+                    name='run.progress',
+                    checked=self.checked,
+                    worked=self.worked
+                )
+            )
+
+    async def handle(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ):
+        """
+        Обработчик соединения "воркера"
+
+        :param reader: Чтение
+        :type reader: asyncio.StreamReader
+
+        :param writer: Запись
+        :type writer: asyncio.StreamWriter
+        """
+        self.workers.add(writer)
+        self.handlers.add(asyncio.current_task())
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                kind = message['type']
+
+                if kind == 'lease':
+                    batch = await self.issue(writer)
+                    if batch is not None:
+                        send(writer, {
+                            'type': 'batch',
+                            'batch': batch.id,
+                            'proxies': batch.proxies,
+                            'lease': self.lease
+                        })
+                    elif self.finished.is_set():
+                        send(writer, {'type': 'done'})
+                    else:
+                        send(writer, {'type': 'wait'})
+
+                elif kind == 'renew':
+                    batch = self.leased.get(message['batch'])
+                    if batch is not None and writer in batch.holders:
+                        batch.holders[writer] = time.monotonic() + self.lease
+
+                elif kind == 'results':
+                    for index, data in message['proxies']:
+                        self.result(message['batch'], index, data)
+
+                elif kind == 'complete':
+                    self.complete(writer, message['batch'])
+
+                    # Ждем медленные обработчики прогресса
+                    if self.emitter.queued:
+                        await self.emitter.wait()
+
+                await writer.drain()
+        except (OSError, ValueError, KeyError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # Пачки отключившегося "воркера" выдаются заново
+            self.workers.discard(writer)
+            self.handlers.discard(asyncio.current_task())
+            for batch in list(self.leased.values()):
+                if writer in batch.holders:
+                    self.release(writer, batch)
+            writer.close()
+
+    async def expire(self):
+        """
+        Задача, которая забирает пачки
+        у "воркеров", не продлевающих аренду
+        """
+        while True:
+            await asyncio.sleep(min(self.lease / 3, 1))
+            now = time.monotonic()
+            for batch in list(self.leased.values()):
+                for holder, deadline in list(batch.holders.items()):
+                    if deadline < now:
+                        self.release(holder, batch)
+
+    async def serve(self, address: str) -> AsyncIterator[WorkedProxy]:
+        """
+        Запустить координатор и отдавать
+        рабочие прокси по мере получения,
+        пока все пачки не будут проверены
+
+        :param address: Адрес: `host:port`
+            или `unix:/path/to.sock`
+        :type address: str
+
+        :return: Асинхронный генератор рабочих прокси
+        :rtype: AsyncIterator[WorkedProxy]
+        """
+        options = parse_address(address)
+        if 'path' in options:
+            server = await asyncio.start_unix_server(
+                self.handle, options['path'], limit=LINE_LIMIT
+            )
+        else:
+            server = await asyncio.start_server(
+                self.handle, options['host'], options['port'],
+                limit=LINE_LIMIT
+            )
+
+        expire = asyncio.ensure_future(self.expire())
+        finished = asyncio.ensure_future(self.finished.wait())
+        try:
+            # Пустой список прокси
+            if (batch := await self.read()) is None:
+                self.finished.set()
+            else:
+                self.queue.append(batch)
+
+            while True:
+                result = asyncio.ensure_future(self.results.get())
+                await asyncio.wait(
+                    [result, finished], return_when=asyncio.FIRST_COMPLETED
+                )
+                if result.done():
+                    yield result.result()
+                    continue
+
+                result.cancel()
+                while not self.results.empty():
+                    yield self.results.get_nowait()
+                break
+        finally:
+            expire.cancel()
+            finished.cancel()
+            for writer in list(self.workers):
+                send(writer, {'type': 'done'})
+
+            # Получив 'done', "воркеры" отключаются сами
+            if self.handlers:
+                await asyncio.wait(self.handlers, timeout=CLOSE_TIMEOUT)
+            for writer in list(self.workers):
+                writer.close()
+            server.close()
+            await asyncio.gather(*self.handlers, return_exceptions=True)
+            await server.wait_closed()
+
+
+class Worker:
+    """
+    "Воркер" распределенной проверки:
+    получает пачки прокси у координатора
+    (`Coordinator`), проверяет их своим
+    ProxiesTaster и отправляет рабочие
+    прокси по мере проверки
+
+    .. code-block:: python
+
+        taster = ProxiesTaster([])
+        taster.set_workers('auto')
+
+        checked = await Worker(taster, '10.0.0.1:7500').run()
+
+    :param taster: Настроенный ProxiesTaster
+    :type taster: ProxiesTaster
+
+    :param address: Адрес координатора
+    :type address: str
+
+    :param prefetch: Сколько пачек проверять
+        одновременно (следующая запрашивается
+        заранее)
+    :type prefetch: int
+    """
+    def __init__(self, taster, address: str, prefetch: int = 2):
+        """
+        Иницилизация "воркера"
+
+        :param taster: Настроенный ProxiesTaster
+        :type taster: ProxiesTaster
+
+        :param address: Адрес координатора
+        :type address: str
+
+        :param prefetch: Сколько пачек проверять одновременно
+        :type prefetch: int
+
+        :raises ValueError: Если ProxiesTaster настроен
+            на несколько процессов (пачки проверяются
+            в одном event loop, вместо этого запускается
+            несколько "воркеров")
+        """
+        if taster.processes > 1:
+            raise ValueError(
+                'Worker checks batches in one process, '
+                'start one worker per process instead'
+            )
+
+        self.taster = taster
+        self.address = address
+        self.prefetch = prefetch if prefetch > 0 else 1
+
+        # Проверяемые пачки: номер -> задачи
+        self.batches: dict[int, set[asyncio.Task]] = {}
+
+        # Запрошенные, но еще не полученные пачки
+        self.requested = 0
+
+        self.outbox: list[dict] = []
+        self.results: dict[int, list[dict]] = {}
+        self.checked = 0
+        self.lease = 60
+        self.done = False
+
+    def request(self, writer: asyncio.StreamWriter):
+        """
+        Запросить пачки, если
+        проверяется меньше `prefetch`
+
+        :param writer: Соединение с координатором
+        :type writer: asyncio.StreamWriter
+        """
+        while not self.done and \
+                len(self.batches) + self.requested < self.prefetch:
+            self.requested += 1
+            send(writer, {'type': 'lease'})
+
+    async def check(self, batch_id: int, index: int, proxy: str):
+        """
+        Проверить прокси из пачки
+
+        :param batch_id: Номер пачки
+        :type batch_id: int
+
+        :param index: Номер прокси в пачке
+        :type index: int
+
+        :param proxy: Прокси
+        :type proxy: str
+        """
+        if worked := await self.taster.check(proxy):
+            self.results.setdefault(batch_id, []).append(
+                (index, worked.to_dict())
+            )
+        self.checked += 1
+
+    async def run_batch(
+            self,
+            writer: asyncio.StreamWriter,
+            batch_id: int,
+            proxies: list[str]
+    ):
+        """
+        Проверить пачку и сообщить
+        координатору о её окончании
+
+        :param writer: Соединение с координатором
+        :type writer: asyncio.StreamWriter
+
+        :param batch_id: Номер пачки
+        :type batch_id: int
+
+        :param proxies: Прокси
+        :type proxies: list[str]
+        """
+        tasks = self.batches[batch_id] = {
+            asyncio.ensure_future(self.check(batch_id, index, proxy))
+            for index, proxy in enumerate(proxies)
+        }
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            return
+        finally:
+            self.batches.pop(batch_id, None)
+
+        self.flush(writer)
+        send(writer, {'type': 'complete', 'batch': batch_id})
+        self.request(writer)
+
+    def flush(self, writer: asyncio.StreamWriter):
+        """
+        Отправить накопленные рабочие прокси
+
+        :param writer: Соединение с координатором
+        :type writer: asyncio.StreamWriter
+        """
+        results, self.results = self.results, {}
+        for batch_id, proxies in results.items():
+            send(writer, {
+                'type': 'results', 'batch': batch_id, 'proxies': proxies
+            })
+
+    async def upload(self, writer: asyncio.StreamWriter):
+        """
+        Задача, которая отправляет результаты
+        и продлевает аренду пачек
+
+        :param writer: Соединение с координатором
+        :type writer: asyncio.StreamWriter
+        """
+        renewed = time.monotonic()
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            self.flush(writer)
+
+            if time.monotonic() - renewed >= self.lease / 3:
+                renewed = time.monotonic()
+                for batch_id in self.batches:
+                    send(writer, {'type': 'renew', 'batch': batch_id})
+
+            await writer.drain()
+
+    def cancel(self, batch_id: int):
+        """
+        Отменить проверку пачки (её
+        уже проверил другой "воркер")
+
+        :param batch_id: Номер пачки
+        :type batch_id: int
+        """
+        for task in self.batches.pop(batch_id, ()):
+            task.cancel()
+        self.results.pop(batch_id, None)
+
+    async def run(self) -> int:
+        """
+        Подключиться к координатору и
+        проверять пачки, пока они не
+        закончатся
+
+        :raises ConnectionError: Если координатор
+            отключился раньше окончания работы
+
+        :return: Количество проверенных прокси
+        :rtype: int
+        """
+        # 'auto' по окончательным настройкам
+        self.taster.resolve_workers()
+
+        reader, writer = await open_connection(self.address)
+        upload = asyncio.ensure_future(self.upload(writer))
+        runs: set[asyncio.Task] = set()
+        loop = asyncio.get_running_loop()
+        try:
+            self.request(writer)
+            while line := await reader.readline():
+                message = json.loads(line)
+                kind = message['type']
+
+                if kind == 'batch':
+                    self.requested -= 1
+                    self.lease = message['lease']
+                    run = asyncio.ensure_future(self.run_batch(
+                        writer, message['batch'], message['proxies']
+                    ))
+                    runs.add(run)
+                    run.add_done_callback(runs.discard)
+
+                elif kind == 'wait':
+                    self.requested -= 1
+                    loop.call_later(WAIT_INTERVAL, self.request, writer)
+
+                elif kind == 'cancel':
+                    self.cancel(message['batch'])
+                    self.request(writer)
+
+                elif kind == 'done':
+                    self.done = True
+                    break
+
+            if not self.done:
+                raise ConnectionError('Coordinator closed the connection')
+        finally:
+            self.done = True
+            upload.cancel()
+            for batch_id in list(self.batches):
+                self.cancel(batch_id)
+            await asyncio.gather(upload, *runs, return_exceptions=True)
+            writer.close()
+            await self.taster.close()
+
+        return self.checked
@@ -0,0 +1,325 @@
+# Typing
+from typing import Any
+from typing import Union
+from typing import Callable
+
+# Standarts
+import inspect
+
+# Collections
+from collections import deque
+
+# Asyncio
+import asyncio
+
+# Events
+from event_emitter import EventEmitter
+from event_emitter.events import ListenerWrapper
+
+
+class QueuedListener(ListenerWrapper):
+    """
+    Обработчик, которому события передаются
+    через буфер в отдельной задаче, чтобы
+    он не останавливал проверки прокси
+
+    Обработчик может быть `async def`
+    функцией, а если указан `batch` - он
+    получает список событий: до `batch`
+    штук, либо все, что пришло за `interval`
+    секунд
+
+    Если в буфере `buffer` и больше событий,
+    проверки ждут (`Emitter.wait`), пока
+    обработчик их разберет. Если события
+    передаются без ожидания и буфер
+    вырастает вдвое больше `buffer`, самые
+    старые события отбрасываются (их
+    количество - в `dropped`), чтобы
+    медленный обработчик не занимал
+    память без ограничения
+
+    :param listener: Обработчик
+    :type listener: Callable[[Any], Any]
+
+    :param batch: Размер пачки событий
+        (None - по одному событию)
+    :type batch: Union[int, None]
+
+    :param interval: Сколько ждать
+        заполнения пачки (в секундах)
+    :type interval: float
+
+    :param buffer: Размер буфера событий
+    :type buffer: int
+    """
+    def __init__(
+            self,
+            listener: Callable[[Any], Any],
+            batch: Union[int, None] = None,
+            interval: float = 1,
+            buffer: int = 10000
+    ):
+        super().__init__(listener)
+        self.batch = batch if batch is None or batch > 0 else 1
+        self.interval = interval
+
+        # В буфер должна помещаться целая пачка
+        self.buffer = max(buffer, self.batch or 1)
+
+        self.events = deque()
+        self.dropped = 0
+        self.task: Union[asyncio.Task, None] = None
+        self.closing = False
+
+        # Создаются вместе с задачей
+        # внутри запущенного event loop
+        self.arrived: Union[asyncio.Event, None] = None
+        self.filled: Union[asyncio.Event, None] = None
+        self.drained: Union[asyncio.Event, None] = None
+
+    def __call__(self, event):
+        if len(self.events) >= self.buffer * 2:
+            self.events.popleft()
+            self.dropped += 1
+        self.events.append(event)
+
+        if self.task is None:
+            self.arrived = asyncio.Event()
+            self.filled = asyncio.Event()
+            self.drained = asyncio.Event()
+            self.task = asyncio.ensure_future(self.consume())
+
+        self.arrived.set()
+        if self.batch and len(self.events) >= self.batch:
+            self.filled.set()
+
+    @property
+    def full(self) -> bool:
+        """
+        Заполнен ли буфер событий
+
+        :return: Заполнен ли буфер
+        :rtype: bool
+        """
+        return len(self.events) >= self.buffer
+
+    def take(self) -> Any:
+        """
+        Забрать из буфера одно событие,
+        либо пачку событий
+
+        :return: Событие или список событий
+        :rtype: Any
+        """
+        if not self.batch:
+            return self.events.popleft()
+
+        return [
+            self.events.popleft()
+            for _ in range(min(self.batch, len(self.events)))
+        ]
+
+    async def deliver(self, events: Any):
+        """
+        Передать событие (или пачку)
+        обработчику; ошибки обработчика
+        не останавливают доставку
+
+        :param events: Событие или список событий
+        :type events: Any
+        """
+        try:
+            result = self.listener(events)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as err:
+            asyncio.get_running_loop().call_exception_handler(
+                {
+                    'message': f"Event listener {self.listener!r} failed",
+                    'exception': err
+                }
+            )
+
+    async def consume(self):
+        """
+        Задача, которая разбирает буфер
+        и передает события обработчику
+        """
+        while True:
+            if not self.events:
+                if self.closing:
+                    return
+                self.arrived.clear()
+                await self.arrived.wait()
+                continue
+
+            # Ждем заполнения пачки, но не дольше interval
+            if self.batch and len(self.events) < self.batch \
+                    and not self.closing:
+                self.filled.clear()
+                try:
+                    await asyncio.wait_for(
+                        self.filled.wait(), self.interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            await self.deliver(self.take())
+
+            if not self.full:
+                self.drained.set()
+
+    async def wait(self):
+        """
+        Подождать, пока в буфере
+        освободится место
+        """
+        while self.full and self.task is not None:
+            self.drained.clear()
+            await self.drained.wait()
+
+    async def flush(self):
+        """
+        Передать обработчику все оставшиеся
+        события и остановить задачу
+        """
+        if self.task is None:
+            return
+
+        self.closing = True
+        self.arrived.set()
+        self.filled.set()
+        try:
+            await self.task
+        finally:
+            self.task = None
+            self.closing = False
+            self.drained.set()
+
+
+class Emitter(EventEmitter):
+    """
+    EventEmitter, у которого можно
+    узнать, есть ли обработчики
+    события, до создания его данных,
+    и который поддерживает асинхронные
+    обработчики и обработку пачками
+    (`QueuedListener`)
+
+    Если обработчиков нет - данные
+    события можно не создавать вовсе
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        if emitter.listens('error', 'check.error'):
+            error = ProxyError.create(...)
+            emitter.emit('error', error)
+            emitter.emit('check.error', error)
+    """
+    def __init__(self):
+        super().__init__()
+        self.queued: list[QueuedListener] = []
+
+    def on(
+            self,
+            event: str,
+            listener: Callable[[Any], Any],
+            batch: Union[int, None] = None,
+            interval: float = 1,
+            buffer: int = 10000
+    ):
+        """
+        Установить обработчик события:
+        `async def` функции и обработчики
+        пачек событий получают события
+        через буфер (`QueuedListener`),
+        остальные - сразу
+
+        :param event: Название события
+        :type event: str
+
+        :param listener: Обработчик
+        :type listener: Callable[[Any], Any]
+
+        :param batch: Размер пачки событий
+        :type batch: Union[int, None]
+
+        :param interval: Сколько ждать заполнения пачки
+        :type interval: float
+
+        :param buffer: Размер буфера событий
+        :type buffer: int
+        """
+        if batch is None and not asyncio.iscoroutinefunction(listener):
+            super().on(event, listener)
+        else:
+            queued = QueuedListener(listener, batch, interval, buffer)
+            self.queued.append(queued)
+            self._on(event, queued)
+
+    def listens(self, *events: str) -> bool:
+        """
+        Есть ли обработчики хотя
+        бы у одного из событий
+
+        :param events: Названия событий
+        :type events: str
+
+        :return: Есть ли обработчики
+        :rtype: bool
+        """
+        listeners = self._events
+        for event in events:
+            if listeners.get(event):
+                return True
+        return False
+
+    def listened(self, *ignore: Callable[[Any], Any]) -> list[str]:
+        """
+        Названия событий, у которых есть
+        обработчики (кроме `ignore`)
+
+        :param ignore: Не учитываемые обработчики
+        :type ignore: Callable[[Any], Any]
+
+        :return: Названия событий
+        :rtype: list[str]
+        """
+        return [
+            event for event, listeners in self._events.items()
+            if any(listener.listener not in ignore for listener in listeners)
+        ]
+
+    def emit(self, event, *args, **kwargs):
+        listeners = self._events.get(event)
+        if not listeners:
+            return
+
+        # once-обработчики удаляются во время
+        # вызова, поэтому перебираем копию
+        for listener in listeners[:]:
+            if listener.is_once:
+                self.remove(event, listener)
+            listener(*args, **kwargs)
+
+    async def wait(self):
+        """
+        Подождать, пока в буферах
+        обработчиков освободится место
+        (ограничивает скорость проверок
+        скоростью обработчиков)
+        """
+        for queued in self.queued:
+            if queued.full:
+                await queued.wait()
+
+    async def flush(self):
+        """
+        Передать обработчикам все события
+        из буферов и остановить их задачи
+        """
+        for queued in self.queued:
+            await queued.flush()
@@ -14,6 +14,7 @@ from .types import WorkedProxy
 
 from .types import Proxies
 from .types import Protocol
+from .types import ParsedProxy
 
 
 class Events(Enum):
@@ -59,6 +60,11 @@ class Events(Enum):
     :param check_error: Какая-либо ошибка при
         работе метода `taster.check`
     :type check_error: str
+
+    :param progress: Счетчики проверенных и
+        рабочих прокси (при проверке в
+        нескольких процессах)
+    :type progress: str
     """
     error: str          = 'error'
     except_: str        = 'except.start'
@@ -70,6 +76,7 @@ class Events(Enum):
     check_end: str      = 'check.end'
     check_success: str  = 'check.success'
     check_error: str    = 'check.error'
+    progress: str       = 'run.progress'
 
 @dataclass
 class Event:
@@ -163,12 +170,12 @@ class Proxy(Event):
     :param protocol: Протокол прокси: HTTP, SOCKS4 и т.д.
     :type protocol: Protocol
 
-    :param proxy: Сама строка прокси или
-        уже рабочий прокси
-    :type proxy: str
+    :param proxy: Сама строка прокси, разобранный
+        прокси или уже рабочий прокси
+    :type proxy: Union[str, ParsedProxy, WorkedProxy]
     """
     protocol: Union[Protocol, False]
-    proxy: Union[str, WorkedProxy]
+    proxy: Union[str, ParsedProxy, WorkedProxy]
 
 
 @dataclass
@@ -216,3 +223,19 @@ class RunEnd(Event):
     :type proxies: list[WorkedProxy]
     """
     proxies: list[WorkedProxy]
+
+
+@dataclass
+class Progress(Event):
+    """
+    Данные события с общими счетчиками
+    проверки в нескольких процессах
+
+    :param checked: Количество проверенных прокси
+    :type checked: int
+
+    :param worked: Количество рабочих прокси
+    :type worked: int
+    """
+    checked: int
+    worked: int
@@ -3,5 +3,10 @@ class TooManyOpenFilesError(Exception):
         super().__init__(message)
         self.previous = previous
 
+    def __reduce__(self):
+        # Исходная ошибка может не передаваться
+        # в другой процесс
+        return (type(self), (str(self), None))
+
     def getPrevious() -> Exception:
         return self.previous
@@ -0,0 +1,65 @@
+# Typing
+from typing import Union
+
+# Random
+import random
+
+# UserAgent
+from fake_useragent import UserAgent
+
+
+class HeadersPool:
+    """
+    Заранее подготовленный набор
+    заголовков со случайными User-Agent,
+    общий для всех проверок
+
+    Набор создается при первом
+    обращении одним объектом UserAgent,
+    поэтому ни время иницилизации, ни
+    память не зависят от количества прокси
+
+    .. code-block:: python
+
+        headers = HeadersPool(50)
+        await session.get(url, headers=headers.get())
+
+    :param size: Количество наборов заголовков
+    :type size: int
+    """
+    def __init__(self, size: int = 100):
+        """
+        Иницилизация набора заголовков
+
+        :param size: Количество наборов заголовков
+        :type size: int
+        """
+        self.size = size if size > 0 else 1
+        self.pool: Union[list[dict], None] = None
+
+    def load(self) -> list[dict]:
+        """
+        Создать наборы заголовков
+
+        :return: Наборы заголовков
+        :rtype: list[dict]
+        """
+        agent = UserAgent()
+        self.pool = [
+            {
+                "User-Agent": agent.random,
+                "Accept": "*/*",
+                "Proxy-Connection": "Keep-Alive"
+            } for _ in range(self.size)
+        ]
+        return self.pool
+
+    def get(self) -> dict:
+        """
+        Получить случайный набор заголовков
+        (не должен изменяться)
+
+        :return: Заголовки для запроса через прокси
+        :rtype: dict
+        """
+        return random.choice(self.pool or self.load())
@@ -0,0 +1,218 @@
+# Typing
+from typing import Any
+from typing import Union
+from typing import Iterable
+from typing import Iterator
+
+# Standarts
+import os
+import json
+import time
+
+# Types
+from .types import WorkedProxy
+
+# Parser
+from .parser import proxy_string
+
+
+class Journal:
+    """
+    Журнал проверки: файл, в конец
+    которого дописывается каждый
+    проверенный прокси и его результат,
+    чтобы прерванную проверку можно
+    было продолжить (`resume`)
+
+    Строка журнала - `-прокси` для
+    нерабочего прокси и `+прокси<TAB>json`
+    для рабочего (`WorkedProxy.to_dict`).
+    Записи передаются системе пачками
+    (каждые `batch` записей или `interval`
+    секунд), поэтому при падении теряются
+    только последние записи, и эти прокси
+    просто проверяются заново
+
+    .. code-block:: python
+
+        journal = Journal('run.journal', resume=True)
+        taster.set_journal(journal)
+
+        # Рабочие прокси прошлого запуска
+        result = list(journal.worked.values())
+        result += await taster.run()
+        journal.close()
+
+    :param path: Путь до файла журнала
+    :type path: str
+
+    :param resume: Продолжить проверку: загрузить
+        записи журнала (иначе журнал начинается
+        заново)
+    :type resume: bool
+
+    :param overwrite: Разрешить начать заново
+        непустой журнал (иначе его записи
+        не стираются случайным запуском
+        без `resume`)
+    :type overwrite: bool
+
+    :param batch: Через сколько записей
+        передавать их системе
+    :type batch: int
+
+    :param interval: Через сколько секунд
+        передавать записи системе
+    :type interval: float
+    """
+    def __init__(
+            self,
+            path: str,
+            resume: bool = False,
+            overwrite: bool = False,
+            batch: int = 1000,
+            interval: float = 1
+    ):
+        """
+        Иницилизация журнала
+
+        :param path: Путь до файла журнала
+        :type path: str
+
+        :param resume: Загрузить записи журнала
+        :type resume: bool
+
+        :param overwrite: Разрешить начать заново непустой журнал
+        :type overwrite: bool
+
+        :param batch: Через сколько записей передавать их системе
+        :type batch: int
+
+        :param interval: Через сколько секунд передавать записи
+        :type interval: float
+
+        :raises FileExistsError: Если журнал не пустой,
+            а ни `resume`, ни `overwrite` не указаны
+        """
+        self.path = path
+        self.batch = batch if batch > 0 else 1
+        self.interval = interval
+
+        # Проверенные прокси и рабочие из них
+        self.checked: set[str] = set()
+        self.worked: dict[str, WorkedProxy] = {}
+
+        if resume and os.path.exists(path):
+            self.load()
+        else:
+            if not overwrite and os.path.exists(path) \
+                    and os.path.getsize(path):
+                raise FileExistsError(
+                    f"Journal '{path}' is not empty "
+                    '(resume it or allow overwriting)'
+                )
+            open(path, 'w').close()
+
+        self.file = open(path, 'a', encoding='utf-8')
+        self.unflushed = 0
+        self.flushed = time.monotonic()
+
+    def load(self):
+        """
+        Загрузить записи журнала (оборванная
+        при падении последняя строка
+        отрезается)
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        complete = 0
+        with open(self.path, 'rb') as file:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                complete += len(line)
+
+                mark, proxy = line[:1], line[1:-1].decode('utf-8')
+                if mark == b'+':
+                    proxy, _, data = proxy.partition('\t')
+                    self.worked[proxy] = WorkedProxy.from_dict(
+                        json.loads(data)
+                    )
+                self.checked.add(proxy)
+
+        os.truncate(self.path, complete)
+
+    def pending(self, proxies: Iterable) -> Iterator[Any]:
+        """
+        Прокси, которых еще нет в журнале
+
+        :param proxies: Прокси
+        :type proxies: Iterable
+
+        :return: Генератор непроверенных прокси
+        :rtype: Iterator[Any]
+        """
+        checked = self.checked
+        if not checked:
+            yield from proxies
+            return
+
+        for proxy in proxies:
+            if proxy_string(proxy) not in checked:
+                yield proxy
+
+    def record(
+            self,
+            proxy: Any,
+            result: Union[WorkedProxy, bool]
+    ):
+        """
+        Записать результат проверки прокси
+
+        :param proxy: Прокси (как во входных данных)
+        :type proxy: Any
+
+        :param result: Рабочий прокси или False
+        :type result: Union[WorkedProxy, bool]
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        proxy = proxy_string(proxy)
+        if result:
+            self.file.write(
+                f"+{proxy}\t{json.dumps(result.to_dict())}\n"
+            )
+        else:
+            self.file.write(f"-{proxy}\n")
+
+        self.unflushed += 1
+        if self.unflushed >= self.batch \
+                or time.monotonic() - self.flushed >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Передать накопленные записи системе
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.file.flush()
+        self.unflushed = 0
+        self.flushed = time.monotonic()
+
+    def close(self):
+        """
+        Сбросить журнал на диск и закрыть
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if self.file.closed:
+            return
+
+        self.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
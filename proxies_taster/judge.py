@@ -0,0 +1,322 @@
+"""Module allowing for ``python -m proxies_taster.judge ...``."""
+
+# Typing
+from typing import Any
+from typing import Union
+from typing import Callable
+from typing import Iterable
+
+# Args
+import argparse
+
+# Dataclass
+from dataclasses import dataclass
+
+# Yarl
+from yarl import URL
+
+# Json
+import json
+
+# Aiohttp
+from aiohttp import web
+from aiohttp import ClientResponse
+
+# Types
+from .types import Protocol
+
+
+@dataclass
+class Judge:
+    """
+    Сервер ("судья"), через запрос
+    к которому проверяются прокси,
+    и правила проверки его ответа
+
+    HTTP прокси проверяются запросом
+    к `url`, а остальные - к `https_url`
+    (если он не указан - тоже к `url`).
+    HTTPS прокси (туннель CONNECT)
+    проверяются только при `https_url`:
+    запрос к `url` через них ничем не
+    отличается от проверки HTTP прокси
+
+    .. code-block:: python
+
+        taster.set_judge(
+            Judge(
+                url='http://10.0.0.2:8080/',
+                statuses=[200],
+                ip='ip'
+            )
+        )
+
+    :param url: Адрес для HTTP прокси
+    :type url: str
+
+    :param https_url: Адрес для остальных прокси
+    :type https_url: Union[str, None]
+
+    :param statuses: Допустимые коды ответа
+        (None - любые)
+    :type statuses: Union[Iterable[int], None]
+
+    :param matcher: Проверка тела ответа
+        (None - любое тело)
+    :type matcher: Union[Callable[[Any], bool], None]
+
+    :param ip: Поле ответа с ip прокси
+        (None - не нужно)
+    :type ip: Union[str, None]
+
+    :param country: Поле ответа со страной
+        прокси (None - не нужно)
+    :type country: Union[str, None]
+
+    :param limit: Сколько байт тела ответа
+        читать не больше (0 - проверять только
+        код ответа, None - без ограничения).
+        Тело не читается вовсе, если из него
+        ничего не нужно (нет `matcher`, `ip`
+        и `country`)
+    :type limit: Union[int, None]
+    """
+    url: str = 'http://ipinfo.io/json'
+    https_url: Union[str, None] = 'https://ipinfo.io/json'
+    statuses: Union[Iterable[int], None] = None
+    matcher: Union[Callable[[Any], bool], None] = None
+    ip: Union[str, None] = 'ip'
+    country: Union[str, None] = 'country'
+    limit: Union[int, None] = 1 << 16
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'Judge':
+        """
+        Создать "судью" по одному адресу:
+        если он https - HTTP прокси
+        проверяются тем же адресом по http
+
+        :param url: Адрес "судьи"
+        :type url: str
+
+        :return: "Судья"
+        :rtype: Judge
+        """
+        parsed = URL(url)
+        if parsed.scheme == 'https':
+            # Явно указанный порт сохраняется
+            return cls(
+                url=str(parsed.with_scheme('http')),
+                https_url=url,
+                **kwargs
+            )
+        return cls(url=url, https_url=None, **kwargs)
+
+    def url_for(self, protocol: Protocol) -> str:
+        """
+        Адрес, к которому обращаться
+        через прокси с этим протоколом
+
+        :param protocol: Протокол прокси
+        :type protocol: Protocol
+
+        :return: Адрес "судьи"
+        :rtype: str
+        """
+        if protocol == Protocol.HTTP or not self.https_url:
+            return self.url
+        return self.https_url
+
+    def supports(self, protocol: Protocol) -> bool:
+        """
+        Можно ли проверить через "судью"
+        прокси с этим протоколом
+
+        :param protocol: Протокол прокси
+        :type protocol: Protocol
+
+        :return: Можно ли проверить
+        :rtype: bool
+        """
+        return protocol != Protocol.HTTPS or bool(self.https_url)
+
+    def target(self) -> tuple[str, int]:
+        """
+        Хост и порт "судьи" для рукопожатий
+        (`proxies_taster.probe.fingerprint`)
+
+        :return: Хост и порт
+        :rtype: tuple[str, int]
+        """
+        url = URL(self.https_url or self.url)
+        return url.host, url.port
+
+    def hosts(self) -> set[str]:
+        """
+        Хосты "судьи" (например для
+        закрепления в кеше DNS)
+
+        :return: Хосты
+        :rtype: set[str]
+        """
+        return {
+            URL(url).host for url in (self.url, self.https_url) if url
+        }
+
+    def accepts(self, status: int, body: Any) -> bool:
+        """
+        Подходит ли ответ "судьи"
+
+        :param status: Http код ответа
+        :type status: int
+
+        :param body: Тело ответа (dict, если json;
+            строка, если тело не json или обрезано
+            по `limit`)
+        :type body: Any
+
+        :return: Подходит ли ответ
+        :rtype: bool
+        """
+        if self.statuses is not None and status not in self.statuses:
+            return False
+
+        # Тело не читалось (limit=0)
+        if self.matcher is None or not self.needs_body():
+            return True
+        return bool(self.matcher(body))
+
+    def field(self, body: Any, name: Union[str, None]) -> Union[Any, False]:
+        """
+        Получить поле из тела ответа
+
+        :param body: Тело ответа
+        :type body: Any
+
+        :param name: Название поля
+        :type name: Union[str, None]
+
+        :return: Значение поля, либо False
+        :rtype: Union[Any, False]
+        """
+        if name is None or not isinstance(body, dict):
+            return False
+        return body.get(name, False)
+
+    def needs_body(self) -> bool:
+        """
+        Нужно ли читать тело ответа
+
+        :return: Нужно ли тело
+        :rtype: bool
+        """
+        return self.limit != 0 and bool(
+            self.matcher or self.ip or self.country
+        )
+
+    async def read(self, response: ClientResponse) -> Any:
+        """
+        Прочитать тело ответа, но не больше
+        `limit` байт, чтобы прокси, который
+        отдает огромную страницу или тянет
+        ответ по байту, не занимал проверку
+
+        :param response: Ответ "судьи"
+        :type response: ClientResponse
+
+        :return: Тело ответа: dict (или другое
+            значение), если это json, иначе
+            строка; None, если тело не нужно
+        :rtype: Any
+        """
+        if not self.needs_body():
+            return None
+
+        chunks = []
+        size = 0
+        while self.limit is None or size < self.limit:
+            chunk = await response.content.read(
+                -1 if self.limit is None else self.limit - size
+            )
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+
+        data = b''.join(chunks)
+        try:
+            return json.loads(data)
+        except ValueError:
+            return data.decode(response.charset or 'utf-8', 'replace')
+
+
+async def echo(request: web.Request) -> web.Response:
+    """
+    Обработчик локального "судьи":
+    возвращает ip и заголовки клиента
+
+    :param request: Запрос
+    :type request: web.Request
+
+    :return: Json ответ
+    :rtype: web.Response
+    """
+    return web.json_response(
+        {
+            'ip': request.remote,
+            'headers': dict(request.headers)
+        }
+    )
+
+
+def judge_app() -> web.Application:
+    """
+    Приложение локального "судьи",
+    которое отвечает на любой GET
+    запрос ip и заголовками клиента
+
+    :return: Приложение aiohttp
+    :rtype: web.Application
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        web.run_app(judge_app(), port=8080)
+
+        # Или из терминала
+        # python -m proxies_taster.judge --port 8080
+    """
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', echo)
+    return app
+
+
+def main():
+    """
+    Запуск локального "судьи"
+    из терминала
+    """
+    parser = argparse.ArgumentParser(
+        description="Локальный сервер для проверки прокси, возвращающий ip и заголовки клиента"
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        help="Адрес, на котором запускать сервер",
+        default='0.0.0.0'
+    )
+    parser.add_argument(
+        "--port",
+        "-p",
+        type=int,
+        help="Порт, на котором запускать сервер",
+        default=8080
+    )
+    args = parser.parse_args()
+
+    web.run_app(judge_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
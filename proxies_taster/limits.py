@@ -0,0 +1,131 @@
+# Typing
+from typing import Union
+
+# Resource (только unix)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+DESCRIPTORS_PER_WORKER = 2
+"""Дескрипторов на одного "воркера": сокет
+соединения с прокси и запас на сокеты,
+которые еще закрываются"""
+
+PROBE_DESCRIPTORS = 1
+"""Дополнительный дескриптор "воркера" при
+определении протокола рукопожатием: сокет
+прошлого рукопожатия еще закрывается,
+когда открывается следующий"""
+
+RESERVED_DESCRIPTORS = 128
+"""Дескрипторы, необходимые самому процессу:
+стандартные потоки, логи, event loop,
+потоки резолвера DNS, файлы результатов"""
+
+DEFAULT_WORKERS = 200
+"""Количество "воркеров", если лимит
+дескрипторов определить нельзя"""
+
+
+def nofile_limit(raise_limit: bool = True) -> Union[int, None]:
+    """
+    Получить лимит открытых файлов
+    (RLIMIT_NOFILE), при необходимости
+    подняв мягкий лимит до жесткого
+
+    :param raise_limit: Поднять ли мягкий лимит
+    :type raise_limit: bool
+
+    :return: Мягкий лимит, либо None, если
+        его нельзя определить (например на Windows)
+    :rtype: Union[int, None]
+    """
+    if resource is None:
+        return None
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if raise_limit and soft != hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+            soft = hard
+        except (ValueError, OSError):
+            pass
+
+    return None if soft == resource.RLIM_INFINITY else soft
+
+
+def port_capacity() -> Union[int, None]:
+    """
+    Количество локальных (эфемерных)
+    портов для исходящих соединений
+
+    :return: Размер диапазона портов, либо None,
+        если его нельзя определить
+    :rtype: Union[int, None]
+    """
+    try:
+        with open(
+                '/proc/sys/net/ipv4/ip_local_port_range', 'r'
+        ) as ports:
+            low, high = map(int, ports.read().split())
+    except (OSError, ValueError):
+        return None
+
+    return high - low + 1
+
+
+def auto_workers(
+        raise_limit: bool = True,
+        extra: int = 0,
+        per_worker: int = DESCRIPTORS_PER_WORKER,
+        reserved: int = RESERVED_DESCRIPTORS,
+        processes: int = 1
+) -> int:
+    """
+    Безопасное количество "воркеров"
+    одного процесса по лимиту открытых
+    файлов (он у каждого процесса свой)
+    и количеству локальных портов (они
+    общие для всех процессов проверки)
+
+    :param raise_limit: Поднять ли мягкий лимит
+        открытых файлов до жесткого
+    :type raise_limit: bool
+
+    :param extra: Дескрипторы, занятые кроме
+        "воркеров" (например предварительной
+        проверкой TCP подключения)
+    :type extra: int
+
+    :param per_worker: Дескрипторов на одного "воркера"
+    :type per_worker: int
+
+    :param reserved: Дескрипторы, необходимые самому процессу
+    :type reserved: int
+
+    :param processes: Количество процессов проверки
+    :type processes: int
+
+    :return: Количество "воркеров"
+    :rtype: int
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        taster.set_workers(auto_workers())
+    """
+    limit = nofile_limit(raise_limit)
+    if limit is None:
+        return DEFAULT_WORKERS
+
+    workers = (limit - reserved - extra) // per_worker
+
+    # Каждое соединение занимает локальный
+    # порт, порты делятся между процессами
+    if (ports := port_capacity()) is not None:
+        workers = min(workers, ports // max(processes, 1) - extra)
+
+    return max(workers, 1)
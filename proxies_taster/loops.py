@@ -0,0 +1,120 @@
+# Typing
+from typing import Any
+from typing import Literal
+from typing import Coroutine
+
+# Asyncio
+import asyncio
+
+# Uvloop (необязательная зависимость)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+Loop = Literal['auto', 'asyncio', 'uvloop']
+"""Реализация event loop: 'auto' - uvloop,
+если он установлен, иначе asyncio"""
+
+LOOPS = ('auto', 'asyncio', 'uvloop')
+"""Доступные значения `Loop`"""
+
+
+def loop_policy(loop: Loop = 'auto') -> asyncio.AbstractEventLoopPolicy:
+    """
+    Политика event loop для
+    выбранной реализации
+
+    :param loop: Реализация event loop
+    :type loop: Loop
+
+    :raises ImportError: Если выбран uvloop,
+        но он не установлен
+    :raises ValueError: Если реализация неизвестна
+
+    :return: Политика event loop
+    :rtype: asyncio.AbstractEventLoopPolicy
+    """
+    if loop not in LOOPS:
+        raise ValueError(
+            f"Unknown event loop '{loop}' (one of {', '.join(LOOPS)})"
+        )
+
+    if loop == 'uvloop' and uvloop is None:
+        raise ImportError(
+            "uvloop is not installed (pip install proxies-taster[uvloop])"
+        )
+
+    if loop != 'asyncio' and uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+def use_loop(loop: Loop = 'auto') -> str:
+    """
+    Установить реализацию event loop
+    для всех последующих `asyncio.run`
+
+    :param loop: Реализация event loop
+    :type loop: Loop
+
+    :return: Название установленной
+        реализации: 'asyncio' или 'uvloop'
+    :rtype: str
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        from proxies_taster.loops import use_loop
+
+        use_loop('uvloop')
+        asyncio.run(taster.run())
+    """
+    asyncio.set_event_loop_policy(loop_policy(loop))
+    return current_loop()
+
+
+def current_loop() -> str:
+    """
+    Название текущей реализации
+    event loop (по установленной политике)
+
+    :return: 'asyncio' или 'uvloop'
+    :rtype: str
+    """
+    policy = asyncio.get_event_loop_policy()
+    if uvloop is not None and isinstance(policy, uvloop.EventLoopPolicy):
+        return 'uvloop'
+    return 'asyncio'
+
+
+def run(main: Coroutine, loop: Loop = 'auto') -> Any:
+    """
+    Запустить корутину в выбранной
+    реализации event loop
+
+    :param main: Корутина
+    :type main: Coroutine
+
+    :param loop: Реализация event loop
+    :type loop: Loop
+
+    :return: Результат корутины
+    :rtype: Any
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        from proxies_taster.loops import run
+
+        result = run(taster.run(), 'auto')
+    """
+    try:
+        use_loop(loop)
+    except (ImportError, ValueError):
+        main.close()
+        raise
+    return asyncio.run(main)
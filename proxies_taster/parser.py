@@ -0,0 +1,128 @@
+# Typing
+from typing import Union
+from typing import TextIO
+from typing import Iterator
+
+# Regex
+import re
+
+# Types
+from .types import ProxyDict
+from .types import ParsedProxy
+
+
+SEPARATORS = re.compile(r'[\s,]+')
+"""Разделители прокси: перевод
+строки, пробелы и запятые"""
+
+
+def normalize(proxy: str) -> str:
+    """
+    Приводит строку прокси к общему
+    виду (протокол в нижнем регистре)
+
+    :param proxy: Сам прокси
+    :type proxy: str
+
+    :return: Нормализованный прокси
+    :rtype: str
+    """
+    scheme, separator, address = proxy.partition('://')
+    return f"{scheme.lower()}://{address}" if separator else proxy
+
+
+def proxy_string(proxy: Union[str, ProxyDict, ParsedProxy]) -> str:
+    """
+    Прокси в виде строки (вместе с
+    протоколом), например для передачи в
+    другой процесс или записи в журнал
+
+    :param proxy: Прокси
+    :type proxy: Union[str, ProxyDict, ParsedProxy]
+
+    :return: Строка прокси
+    :rtype: str
+    """
+    if isinstance(proxy, ProxyDict):
+        return f"{proxy.protocol.value}://{proxy.proxy}"
+
+    if isinstance(proxy, ParsedProxy) and proxy.protocol:
+        return f"{proxy.protocol.value}://{proxy}"
+    return str(proxy)
+
+
+def iter_proxies(
+        stream: TextIO,
+        chunk_size: int = 1 << 20
+) -> Iterator[str]:
+    """
+    Читает прокси из файла (или
+    любого текстового потока) частями
+    и отдает их по одному, пропуская
+    повторы
+
+    Файл не загружается в память
+    целиком, а каждый прокси
+    обрабатывается один раз
+
+    :param stream: Текстовый поток с прокси,
+        разделенными переводом строки,
+        пробелом или запятой
+    :type stream: TextIO
+
+    :param chunk_size: Размер читаемой части
+    :type chunk_size: int
+
+    :return: Генератор уникальных прокси
+    :rtype: Iterator[str]
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        with open('proxies.txt', encoding='UTF-8') as proxies:
+            taster = ProxiesTaster(iter_proxies(proxies))
+            result = await taster.run()
+    """
+    seen = set()
+    rest = ''
+    while chunk := stream.read(chunk_size):
+        proxies = SEPARATORS.split(rest + chunk)
+
+        # Последний прокси может быть
+        # разрезан границей части
+        rest = proxies.pop()
+        for proxy in proxies:
+            if proxy and (proxy := normalize(proxy)) not in seen:
+                seen.add(proxy)
+                yield proxy
+
+    if rest and (rest := normalize(rest)) not in seen:
+        yield rest
+
+
+def read_proxies(
+        path: str,
+        chunk_size: int = 1 << 20
+) -> Iterator[str]:
+    """
+    Читает прокси из файла по пути,
+    файл закрывается после прочтения
+
+    :param path: Путь до файла со списком прокси
+    :type path: str
+
+    :param chunk_size: Размер читаемой части
+    :type chunk_size: int
+
+    :return: Генератор уникальных прокси
+    :rtype: Iterator[str]
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        taster = ProxiesTaster(read_proxies('proxies.txt'))
+    """
+    with open(path, 'r', encoding='UTF-8') as stream:
+        yield from iter_proxies(stream, chunk_size)
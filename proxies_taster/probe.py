@@ -0,0 +1,264 @@
+# Typing
+from typing import Union
+
+# Base64
+import base64
+
+# Struct
+import struct
+
+# Asyncio
+import asyncio
+
+# Types
+from .types import Protocol
+
+
+SOCKS5_GREETING = b'\x05\x02\x00\x02'
+"""Приветствие SOCKS5: версия и два метода
+авторизации (без авторизации и логин/пароль)"""
+
+
+def socks4_request(host: str, port: int, user: str = '') -> bytes:
+    """
+    Запрос CONNECT для SOCKS4a, с
+    передачей домена вместо ip
+
+    :param host: Домен, к которому подключаться
+    :type host: str
+
+    :param port: Порт, к которому подключаться
+    :type port: int
+
+    :param user: Идентификатор пользователя
+    :type user: str
+
+    :return: Байты запроса
+    :rtype: bytes
+    """
+    return b''.join(
+        [
+            b'\x04\x01',
+            struct.pack('>H', port),
+            b'\x00\x00\x00\x01',
+            user.encode(), b'\x00',
+            host.encode(), b'\x00'
+        ]
+    )
+
+
+def connect_request(
+        host: str, port: int, auth: Union[str, None] = None
+) -> bytes:
+    """
+    Запрос HTTP CONNECT
+
+    :param host: Домен, к которому подключаться
+    :type host: str
+
+    :param port: Порт, к которому подключаться
+    :type port: int
+
+    :param auth: Логин и пароль прокси (login:password)
+    :type auth: Union[str, None]
+
+    :return: Байты запроса
+    :rtype: bytes
+    """
+    lines = [
+        f"CONNECT {host}:{port} HTTP/1.1",
+        f"Host: {host}:{port}"
+    ]
+    if auth:
+        lines.append(
+            'Proxy-Authorization: Basic '
+            + base64.b64encode(auth.encode()).decode()
+        )
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode()
+
+
+async def reachable(host: str, port: int, timeout: float = 1) -> bool:
+    """
+    Проверяет, принимает ли прокси
+    TCP соединения (без отправки
+    каких-либо данных)
+
+    :param host: Хост прокси
+    :type host: str
+
+    :param port: Порт прокси
+    :type port: int
+
+    :param timeout: Время ожидания подключения
+    :type timeout: float
+
+    :return: Удалось ли подключиться
+    :rtype: bool
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        if await reachable('107.174.66.231', 36626, 0.5):
+            ...
+    """
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+    writer.close()
+    return True
+
+
+async def handshake(
+        host: str,
+        port: int,
+        request: bytes,
+        size: int,
+        timeout: float
+) -> bytes:
+    """
+    Открывает соединение, отправляет
+    запрос и читает первые байты ответа
+
+    Ошибки подключения (OSError,
+    asyncio.TimeoutError) пробрасываются,
+    а если ответа не было - возвращает
+    пустую строку байтов
+
+    :param host: Хост прокси
+    :type host: str
+
+    :param port: Порт прокси
+    :type port: int
+
+    :param request: Отправляемые байты
+    :type request: bytes
+
+    :param size: Максимальное количество читаемых байтов
+    :type size: int
+
+    :param timeout: Время ожидания подключения
+        и ответа (каждого по отдельности)
+    :type timeout: float
+
+    :return: Первые байты ответа
+    :rtype: bytes
+    """
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port), timeout
+    )
+    try:
+        writer.write(request)
+        await writer.drain()
+        return await asyncio.wait_for(reader.read(size), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return b''
+    finally:
+        writer.close()
+
+
+async def fingerprint(
+        host: str,
+        port: int,
+        protocols: Union[list[Protocol], None] = None,
+        timeout: float = 5,
+        target: tuple[str, int] = ('ipinfo.io', 443),
+        auth: Union[str, None] = None
+) -> Union[Protocol, False]:
+    """
+    Определяет протокол прокси по
+    первым байтам ответа на рукопожатие:
+    приветствие SOCKS5, запрос SOCKS4
+    и HTTP CONNECT (пропуская протоколы,
+    не входящие в `protocols`)
+
+    Рукопожатия разных протоколов нельзя
+    отправить в одно соединение (прокси
+    закрывает его после чужого запроса),
+    поэтому они идут по очереди в отдельных
+    соединениях (одновременно открыт только
+    один сокет, как и у обычной проверки),
+    а все вместе ограничены одним временем
+    `timeout`
+
+    Если прокси ответил как HTTP прокси,
+    а CONNECT прошел успешно - это
+    HTTPS прокси, иначе HTTP
+
+    :param host: Хост прокси
+    :type host: str
+
+    :param port: Порт прокси
+    :type port: int
+
+    :param protocols: Определяемые протоколы
+        (по-умолчанию все)
+    :type protocols: Union[list[Protocol], None]
+
+    :param timeout: Время ожидания всего
+        определения протокола
+    :type timeout: float
+
+    :param target: Хост и порт, к которым просить
+        подключиться прокси
+    :type target: tuple[str, int]
+
+    :param auth: Логин и пароль прокси (login:password)
+    :type auth: Union[str, None]
+
+    :return: Протокол прокси, либо False,
+        если определить его не удалось
+    :rtype: Union[Protocol, False]
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        protocol = await fingerprint('107.174.66.231', 36626)
+    """
+    protocols = list(Protocol) if protocols is None else protocols
+
+    async def detect() -> Union[Protocol, False]:
+        # Прокси уже ответил как HTTP прокси
+        http = False
+
+        if Protocol.SOCKS5 in protocols:
+            reply = await handshake(
+                host, port, SOCKS5_GREETING, 2, timeout
+            )
+            if reply[:1] == b'\x05':
+                return Protocol.SOCKS5
+            http = reply.startswith(b'HTTP/')
+
+        if Protocol.SOCKS4 in protocols and not http:
+            reply = await handshake(
+                host, port, socks4_request(
+                    *target, (auth or '').split(':')[0]
+                ), 8, timeout
+            )
+            if len(reply) >= 2 and reply[0] == 0 \
+               and 0x5A <= reply[1] <= 0x5D:
+                return Protocol.SOCKS4
+
+        if Protocol.HTTP in protocols or Protocol.HTTPS in protocols:
+            reply = await handshake(
+                host, port, connect_request(*target, auth), 12, timeout
+            )
+            if reply.startswith(b'HTTP/'):
+                if reply[9:12] == b'200' and Protocol.HTTPS in protocols:
+                    return Protocol.HTTPS
+                if Protocol.HTTP in protocols:
+                    return Protocol.HTTP
+
+        return False
+
+    try:
+        # Общее ограничение всех рукопожатий
+        return await asyncio.wait_for(detect(), timeout)
+    except (OSError, asyncio.TimeoutError):
+        # Не удалось подключиться к прокси
+        return False
@@ -0,0 +1,459 @@
+# Typing
+from typing import Any
+from typing import Union
+from typing import Iterable
+from typing import AsyncIterator
+
+# Standarts
+import os
+import queue
+import pickle
+import threading
+
+# Dataclasses
+from dataclasses import replace
+
+# Collections
+from collections import deque
+
+# Multiprocessing
+import multiprocessing
+
+# Asyncio
+import asyncio
+
+# Types
+from .types import WorkedProxy
+
+# Loops
+from .loops import run
+from .loops import current_loop
+
+# Events
+from .events_data import Start
+from .events_data import Progress
+
+
+CHUNK_SIZE = 500
+"""Количество прокси, передаваемых
+дочернему процессу за раз"""
+
+FLUSH_INTERVAL = 0.1
+"""Как часто дочерний процесс передает
+результаты, события и счетчики (в секундах)"""
+
+
+def cpu_processes() -> int:
+    """
+    Количество процессов по
+    количеству ядер процессора
+
+    :return: Количество процессов
+    :rtype: int
+    """
+    return os.cpu_count() or 1
+
+
+def child_settings(taster, processes: int) -> dict[str, tuple]:
+    """
+    Настройки для дочерних процессов:
+    "воркеры" 'auto' считаются один раз
+    здесь, с делением общих для всех
+    процессов локальных портов, а не
+    заново в каждом процессе
+
+    :param taster: Настроенный ProxiesTaster
+    :type taster: ProxiesTaster
+
+    :param processes: Количество процессов
+    :type processes: int
+
+    :return: Настройки (как `ProxiesTaster.settings`)
+    :rtype: dict[str, tuple]
+    """
+    settings = dict(taster.settings)
+    if taster.workers_auto:
+        settings['set_workers'] = (
+            (taster.estimate_workers(processes),), {}
+        )
+    return settings
+
+
+def portable(value: Any) -> Any:
+    """
+    Привести результат или данные
+    события к виду, который можно
+    передать в другой процесс: без
+    объекта ответа, без самого
+    ProxiesTaster в аргументах и с
+    ошибкой, которую можно передать
+
+    :param value: Рабочий прокси или данные события
+    :type value: Any
+
+    :return: То же значение, но передаваемое
+    :rtype: Any
+    """
+    if isinstance(value, WorkedProxy):
+        return replace(value, response=None) if value.response else value
+
+    if isinstance(value, Start):
+        value = replace(value, args=value.args[1:])
+
+    if isinstance(getattr(value, 'proxy', None), WorkedProxy):
+        value = replace(value, proxy=portable(value.proxy))
+
+    if exception := getattr(value, 'exception', False):
+        value = replace(value, exception=portable_exception(exception))
+
+    return value
+
+
+def portable_exception(exception: BaseException) -> BaseException:
+    """
+    Ошибка, которую можно передать в
+    другой процесс (если исходную нельзя
+    восстановить - RuntimeError с её описанием)
+
+    :param exception: Ошибка
+    :type exception: BaseException
+
+    :return: Передаваемая ошибка
+    :rtype: BaseException
+    """
+    try:
+        pickle.loads(pickle.dumps(exception))
+        return exception
+    except Exception:
+        return RuntimeError(repr(exception))
+
+
+def worker(
+        cls: type,
+        settings: dict[str, tuple],
+        events: list[str],
+        tasks: multiprocessing.Queue,
+        results: multiprocessing.Queue,
+        loop: str = 'asyncio',
+        journaled: bool = False
+):
+    """
+    Дочерний процесс: создает свой
+    ProxiesTaster с теми же настройками
+    и проверяет получаемые прокси
+
+    :param cls: Класс ProxiesTaster
+    :type cls: type
+
+    :param settings: Настройки (`ProxiesTaster.settings`)
+    :type settings: dict[str, tuple]
+
+    :param events: События, которые нужно
+        передавать родительскому процессу
+    :type events: list[str]
+
+    :param tasks: Очередь пачек прокси (None - конец)
+    :type tasks: multiprocessing.Queue
+
+    :param results: Очередь сообщений родителю
+    :type results: multiprocessing.Queue
+
+    :param loop: Реализация event loop (как у родителя)
+    :type loop: str
+
+    :param journaled: Передавать родителю каждый
+        проверенный прокси (для журнала)
+    :type journaled: bool
+    """
+    try:
+        run(
+            check_tasks(cls, settings, events, tasks, results, journaled),
+            loop
+        )
+    except BaseException as err:
+        results.put([('error', portable_exception(err))])
+    results.put([('done',)])
+
+
+async def check_tasks(
+        cls: type,
+        settings: dict[str, tuple],
+        events: list[str],
+        tasks: multiprocessing.Queue,
+        results: multiprocessing.Queue,
+        journaled: bool = False
+):
+    """
+    Проверка прокси в дочернем процессе:
+    прокси читаются пачками в отдельном
+    потоке, а результаты, события и
+    счетчики копятся и отправляются
+    родителю раз в FLUSH_INTERVAL
+
+    Параметры как у `worker`
+    """
+    loop = asyncio.get_running_loop()
+    taster = cls(())
+    for name, (args, kwargs) in settings.items():
+        getattr(taster, name)(*args, **kwargs)
+
+    outbox = []
+    counters = {'checked': 0, 'worked': 0}
+
+    for name in events:
+        taster.emitter.on(
+            name, lambda event, name=name: outbox.append(
+                ('event', name, portable(event))
+            )
+        )
+
+    async def flush():
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            send()
+
+    def send():
+        nonlocal outbox
+        outbox.append(
+            ('progress', os.getpid(), counters['checked'], counters['worked'])
+        )
+        results.put(outbox)
+        outbox = []
+
+    flusher = asyncio.ensure_future(flush())
+    buffer = deque()
+    pending = {}
+    fetch = None
+    finished = False
+    window = taster.window()
+
+    try:
+        while True:
+            while buffer and len(pending) < window:
+                proxy = buffer.popleft()
+                pending[asyncio.ensure_future(taster.check(proxy))] = proxy
+
+            # Следующую пачку запрашиваем заранее
+            if fetch is None and not finished and len(buffer) < window:
+                fetch = loop.run_in_executor(None, receive, tasks)
+
+            waiting = set(pending) | ({fetch} if fetch else set())
+            if not waiting:
+                break
+
+            done, _ = await asyncio.wait(
+                waiting, return_when=asyncio.FIRST_COMPLETED
+            )
+            if fetch in done:
+                chunk = fetch.result()
+                fetch = None
+                if chunk is None:
+                    finished = True
+                elif chunk is not False:
+                    buffer.extend(chunk)
+
+            for task in done:
+                # Задача чтения следующей пачки
+                if task not in pending:
+                    continue
+
+                proxy = pending.pop(task)
+                counters['checked'] += 1
+                if result := task.result():
+                    counters['worked'] += 1
+                    outbox.append(
+                        ('result', portable(result), proxy) if journaled
+                        else ('result', portable(result))
+                    )
+                elif journaled:
+                    outbox.append(('checked', proxy))
+    finally:
+        flusher.cancel()
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(flusher, *pending, return_exceptions=True)
+        await taster.close()
+        send()
+
+
+def feed(
+        proxies: Iterable,
+        tasks: multiprocessing.Queue,
+        processes: int,
+        stop: threading.Event
+):
+    """
+    Поток родительского процесса: делит
+    прокси на пачки и передает их
+    дочерним процессам
+
+    :param proxies: Прокси
+    :type proxies: Iterable
+
+    :param tasks: Очередь пачек прокси
+    :type tasks: multiprocessing.Queue
+
+    :param processes: Количество дочерних процессов
+    :type processes: int
+
+    :param stop: Остановить передачу
+    :type stop: threading.Event
+    """
+    def put(chunk):
+        while not stop.is_set():
+            try:
+                tasks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    chunk = []
+    for proxy in proxies:
+        if stop.is_set():
+            return
+        chunk.append(proxy)
+        if len(chunk) >= CHUNK_SIZE:
+            put(chunk)
+            chunk = []
+
+    if chunk:
+        put(chunk)
+    for _ in range(processes):
+        put(None)
+
+
+def receive(source: multiprocessing.Queue) -> Union[Any, False]:
+    """
+    Получить значение из очереди другого
+    процесса, ожидая не дольше полсекунды
+    (чтобы ожидающий поток не зависал
+    при завершении работы)
+
+    :param source: Очередь
+    :type source: multiprocessing.Queue
+
+    :return: Значение, либо False, если его пока нет
+    :rtype: Union[Any, False]
+    """
+    try:
+        return source.get(timeout=0.5)
+    except queue.Empty:
+        return False
+
+
+async def shard(
+        taster,
+        proxies: Iterable,
+        processes: int
+) -> AsyncIterator[WorkedProxy]:
+    """
+    Проверить прокси в нескольких
+    процессах (у каждого свой event
+    loop и свой ProxiesTaster с теми же
+    настройками) и отдавать рабочие прокси
+    по мере проверки
+
+    События, у которых в `taster` есть
+    обработчики, передаются из дочерних
+    процессов и вызываются в родительском,
+    а общие счетчики проверенных и рабочих
+    прокси передаются событием `run.progress`
+
+    :param taster: Настроенный ProxiesTaster
+    :type taster: ProxiesTaster
+
+    :param proxies: Прокси
+    :type proxies: Iterable
+
+    :param processes: Количество процессов
+    :type processes: int
+
+    :return: Асинхронный генератор рабочих прокси
+    :rtype: AsyncIterator[WorkedProxy]
+    """
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context('spawn')
+    tasks = context.Queue(processes * 2)
+    results = context.Queue()
+    events = taster.emitter.listened(taster.observe)
+
+    children = [
+        context.Process(
+            target=worker,
+            args=(
+                type(taster), child_settings(taster, processes), events,
+                tasks, results, current_loop(), bool(taster.journal)
+            ),
+            daemon=True
+        )
+        for _ in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    stop = threading.Event()
+    feeder = loop.run_in_executor(
+        None, feed, proxies, tasks, processes, stop
+    )
+
+    progress: dict[int, tuple[int, int]] = {}
+    done = 0
+    error = None
+    try:
+        while done < processes:
+            messages = await loop.run_in_executor(None, receive, results)
+
+            # Ошибка чтения прокси
+            if feeder.done() and feeder.exception():
+                raise feeder.exception()
+
+            if messages is False:
+                # Процесс завершился, не отправив 'done'
+                if all(not child.is_alive() for child in children):
+                    break
+                continue
+
+            for message in messages:
+                kind = message[0]
+                if kind == 'result':
+                    if taster.journal:
+                        taster.journal.record(message[2], message[1])
+                    yield message[1]
+                elif kind == 'checked':
+                    taster.journal.record(message[1], False)
+                elif kind == 'event':
+                    taster.emitter.emit(message[1], message[2])
+                elif kind == 'progress':
+                    progress[message[1]] = message[2:]
+                elif kind == 'error':
+                    error = error or message[1]
+                elif kind == 'done':
+                    done += 1
+
+            if taster.emitter.listens('run.progress'):
+                taster.emitter.emit(
+                    'run.progress', Progress(
+                        name='run.progress',
+                        checked=sum(
+                            checked for checked, _ in progress.values()
+                        ),
+                        worked=sum(
+                            worked for _, worked in progress.values()
+                        )
+                    )
+                )
+
+            # События дочерних процессов передаются
+            # не быстрее, чем их разбирают обработчики
+            if taster.emitter.queued:
+                await taster.emitter.wait()
+
+        if error is not None:
+            raise error
+    finally:
+        stop.set()
+        for child in children:
+            if child.is_alive():
+                child.terminate()
+        for child in children:
+            child.join()
@@ -0,0 +1,229 @@
+# Typing
+from typing import Any
+from typing import Union
+from typing import Iterable
+
+# Standarts
+import time
+import socket
+import ipaddress
+
+# Asyncio
+import asyncio
+
+# Aiohttp
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import DefaultResolver
+from aiohttp.helpers import is_ip_address
+
+
+class CachingResolver(AbstractResolver):
+    """
+    Общий для всех сессий и коннекторов
+    резолвер DNS с кешем: адрес хоста
+    запрашивается один раз за `ttl`
+    секунд, а одновременные запросы
+    одного хоста объединяются
+
+    Закрепленные хосты (`pin`) резолвятся
+    один раз за всю работу, а для хостов
+    из `hosts` DNS не запрашивается вовсе
+
+    .. code-block:: python
+
+        resolver = CachingResolver(
+            ttl=300,
+            hosts={'ipinfo.io': ['34.117.59.81']}
+        )
+        resolver.pin('example.com')
+
+        connector = TCPConnector(resolver=resolver, use_dns_cache=False)
+
+    :param ttl: Время жизни записей (в секундах)
+    :type ttl: float
+
+    :param hosts: Заранее известные адреса хостов
+    :type hosts: Union[dict[str, list[str]], None]
+
+    :param resolver: Резолвер, который делает
+        запросы (по-умолчанию aiohttp DefaultResolver)
+    :type resolver: Union[AbstractResolver, None]
+    """
+    def __init__(
+            self,
+            ttl: float = 60,
+            hosts: Union[dict[str, list[str]], None] = None,
+            resolver: Union[AbstractResolver, None] = None
+    ):
+        """
+        Иницилизация резолвера
+
+        :param ttl: Время жизни записей
+        :type ttl: float
+
+        :param hosts: Заранее известные адреса хостов
+        :type hosts: Union[dict[str, list[str]], None]
+
+        :param resolver: Резолвер, который делает запросы
+        :type resolver: Union[AbstractResolver, None]
+        """
+        self.ttl = ttl
+        self.hosts = dict(hosts or {})
+
+        # Создается внутри запущенного event loop
+        self.resolver = resolver
+        self.default = resolver is None
+
+        # Хосты, которые резолвятся один раз
+        self.pinned: set[str] = set()
+
+        # (хост, порт, семейство) -> (истекает, записи)
+        self.cache: dict[tuple, tuple[float, list[dict]]] = {}
+
+        # Запросы, которые выполняются сейчас
+        self.lookups: dict[tuple, asyncio.Future] = {}
+
+    def pin(self, *hosts: str):
+        """
+        Закрепить хосты: их адреса
+        запрашиваются один раз и
+        больше не обновляются
+
+        :param hosts: Хосты
+        :type hosts: str
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.pinned.update(host for host in hosts if host)
+
+    def records(
+            self, host: str, addresses: Iterable[str], port: int, family: int
+    ) -> list[dict[str, Any]]:
+        """
+        Записи в формате aiohttp для
+        заранее известных адресов
+
+        :param host: Хост
+        :type host: str
+
+        :param addresses: Адреса хоста
+        :type addresses: Iterable[str]
+
+        :param port: Порт
+        :type port: int
+
+        :param family: Семейство адресов
+        :type family: int
+
+        :return: Записи резолвера
+        :rtype: list[dict[str, Any]]
+        """
+        records = []
+        for address in addresses:
+            version = ipaddress.ip_address(address).version
+            address_family = socket.AF_INET6 if version == 6 \
+                else socket.AF_INET
+            if family not in (socket.AF_UNSPEC, address_family):
+                continue
+
+            records.append(
+                {
+                    'hostname': host,
+                    'host': address,
+                    'port': port,
+                    'family': address_family,
+                    'proto': 0,
+                    'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV
+                }
+            )
+        return records
+
+    async def resolve(
+            self,
+            host: str,
+            port: int = 0,
+            family: int = socket.AF_INET
+    ) -> list[dict[str, Any]]:
+        """
+        Адреса хоста (из кеша, если
+        они еще актуальны)
+
+        :param host: Хост
+        :type host: str
+
+        :param port: Порт
+        :type port: int
+
+        :param family: Семейство адресов
+        :type family: int
+
+        :return: Записи резолвера
+        :rtype: list[dict[str, Any]]
+        """
+        if host in self.hosts:
+            return self.records(host, self.hosts[host], port, family)
+
+        key = (host, port, family)
+        cached = self.cache.get(key)
+        if cached is not None and (
+                host in self.pinned or cached[0] > time.monotonic()
+        ):
+            return cached[1]
+
+        # Одновременные запросы одного
+        # хоста ждут один общий запрос
+        lookup = self.lookups.get(key)
+        if lookup is None:
+            if self.resolver is None:
+                self.resolver = DefaultResolver()
+
+            lookup = self.lookups[key] = asyncio.ensure_future(
+                self.resolver.resolve(host, port, family)
+            )
+            lookup.add_done_callback(lambda _: self.lookups.pop(key, None))
+
+        records = await asyncio.shield(lookup)
+        self.cache[key] = (time.monotonic() + self.ttl, records)
+        return records
+
+    async def address(self, host: str, port: int = 0) -> str:
+        """
+        Один IPv4 адрес хоста (например
+        для подключения к прокси, указанному
+        по имени)
+
+        :param host: Хост или ip
+        :type host: str
+
+        :param port: Порт
+        :type port: int
+
+        :raises OSError: Если хост не найден
+
+        :return: Адрес
+        :rtype: str
+        """
+        if is_ip_address(host):
+            return host
+
+        records = await self.resolve(host, port, socket.AF_INET)
+        if not records:
+            raise OSError(f"Could not resolve host '{host}'")
+        return records[0]['host']
+
+    async def close(self):
+        """
+        Закрыть резолвер, который
+        делает запросы
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if self.resolver is not None:
+            await self.resolver.close()
+
+        # Резолвер по-умолчанию привязан к event
+        # loop и создается заново при следующем запуске
+        if self.default:
+            self.resolver = None
@@ -0,0 +1,400 @@
+# Typing
+from typing import Union
+
+# Ssl
+import ssl
+
+# Time
+import time
+
+# Socket
+import socket
+
+# Contextvars
+from contextvars import ContextVar
+from contextvars import Token
+
+# Aiohttp
+import aiohttp
+from aiohttp import TCPConnector
+from aiohttp import ClientOSError
+from aiohttp.helpers import is_ip_address
+from aiohttp.helpers import ceil_timeout
+
+# Proxy
+from aiohttp_proxy import ProxyType
+from aiohttp_proxy.helpers import create_socket_wrapper
+
+# Types
+from .types import Protocol
+from .types import ParsedProxy
+from .types import Timings
+from .types import Timeouts
+
+# Resolver
+from .resolver import CachingResolver
+
+# Concurrency
+from .concurrency import RESOURCE_ERRORS
+
+
+socks_proxy: ContextVar = ContextVar('socks_proxy', default=None)
+"""Прокси, через который общий SOCKS коннектор
+открывает соединение в текущей задаче: тип прокси,
+хост, порт, логин и пароль"""
+
+
+handshake_stage: ContextVar = ContextVar('handshake_stage', default=None)
+"""Таймер подключения к HTTP прокси в текущей
+задаче: после TCP подключения он переносится
+на окончание рукопожатия (CONNECT)"""
+
+
+class SocksConnector(TCPConnector):
+    """
+    Коннектор для SOCKS прокси, который
+    не привязан к одному прокси (как
+    `aiohttp_proxy.ProxyConnector`), а
+    берет его из `socks_proxy`, поэтому
+    может использоваться сразу для всех
+    проверок
+
+    Соединения не переиспользуются
+    (force_close), так как каждое
+    из них идет через свой прокси
+
+    :param timeouts: Ограничения подключения,
+        рукопожатия и TLS
+    :type timeouts: Union[Timeouts, None]
+    """
+    def __init__(self, timeouts: Union[Timeouts, None] = None, **kwargs):
+        super().__init__(force_close=True, **kwargs)
+        self.timeouts = timeouts or Timeouts()
+
+    # noinspection PyMethodOverriding
+    async def _wrap_create_connection(
+            self, protocol_factory, host=None, port=None, *args, **kwargs
+    ):
+        proxy_type, proxy_host, proxy_port, username, password = \
+            socks_proxy.get()
+
+        # Прокси, указанный по имени, резолвится
+        # тем же (общим) резолвером
+        if not is_ip_address(proxy_host):
+            records = await self._resolver.resolve(
+                proxy_host, proxy_port, socket.AF_INET
+            )
+            proxy_host = records[0]['host']
+
+        sock = create_socket_wrapper(
+            loop=self._loop,
+            proxy_type=proxy_type,
+            host=proxy_host,
+            port=proxy_port,
+            username=username,
+            password=password,
+            rdns=False,
+            family=socket.AF_INET
+        )
+
+        # Один таймер: сначала на TCP подключение,
+        # затем на согласование SOCKS
+        async with ceil_timeout(self.timeouts.connect) as stage:
+            negotiate = sock.negotiate
+
+            async def negotiate_in_time():
+                if self.timeouts.handshake is None:
+                    stage.reject()
+                else:
+                    stage.update(self._loop.time() + self.timeouts.handshake)
+                await negotiate()
+
+            sock.negotiate = negotiate_in_time
+            try:
+                await sock.connect((host, port))
+            except OSError as err:
+                # Нехватка сокетов - ошибка проверки (как
+                # в aiohttp), а не падение всей проверки
+                if err.errno in RESOURCE_ERRORS:
+                    raise ClientOSError(err.errno, err.strerror) from err
+                raise
+
+        # TLS с "судьей" (если он по https)
+        async with ceil_timeout(
+                self.timeouts.tls if kwargs.get('ssl') else None
+        ):
+            return await super()._wrap_create_connection(
+                protocol_factory, None, None, *args,
+                sock=sock.socket, **kwargs
+            )
+
+
+class HttpConnector(TCPConnector):
+    """
+    Коннектор для HTTP(S) прокси с
+    отдельными ограничениями времени
+    TCP подключения к прокси, запроса
+    CONNECT и TLS с "судьей"
+
+    :param timeouts: Ограничения подключения,
+        рукопожатия и TLS
+    :type timeouts: Union[Timeouts, None]
+    """
+    def __init__(self, timeouts: Union[Timeouts, None] = None, **kwargs):
+        super().__init__(force_close=True, **kwargs)
+        self.timeouts = timeouts or Timeouts()
+
+    async def _create_proxy_connection(self, req, traces, timeout):
+        async with ceil_timeout(None) as stage:
+            token = handshake_stage.set(stage)
+            try:
+                return await super()._create_proxy_connection(
+                    req, traces, timeout
+                )
+            finally:
+                handshake_stage.reset(token)
+
+    async def _wrap_create_connection(self, *args, **kwargs):
+        async with ceil_timeout(self.timeouts.connect):
+            connection = await super()._wrap_create_connection(
+                *args, **kwargs
+            )
+
+        # Дальше ограничено рукопожатие
+        stage = handshake_stage.get()
+        if stage is not None and self.timeouts.handshake is not None:
+            stage.update(self._loop.time() + self.timeouts.handshake)
+        return connection
+
+    async def _start_tls_connection(self, *args, **kwargs):
+        stage = handshake_stage.get()
+        if stage is not None:
+            stage.reject()
+
+        async with ceil_timeout(self.timeouts.tls):
+            return await super()._start_tls_connection(*args, **kwargs)
+
+
+def timings_trace() -> aiohttp.TraceConfig:
+    """
+    Трассировка запросов, которая
+    записывает время соединения и время
+    до получения заголовков в объект
+    `Timings`, переданный в запрос как
+    `trace_request_ctx`
+
+    :return: Настройки трассировки
+    :rtype: aiohttp.TraceConfig
+    """
+    async def request_start(session, context, params):
+        context.started = time.monotonic()
+
+    async def connection_start(session, context, params):
+        context.connecting = time.monotonic()
+
+    async def connection_end(session, context, params):
+        if isinstance(context.trace_request_ctx, Timings):
+            context.trace_request_ctx.connect = \
+                time.monotonic() - context.connecting
+
+    async def request_end(session, context, params):
+        if isinstance(context.trace_request_ctx, Timings):
+            context.trace_request_ctx.ttfb = \
+                time.monotonic() - context.started
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(request_start)
+    trace.on_connection_create_start.append(connection_start)
+    trace.on_connection_create_end.append(connection_end)
+    trace.on_request_end.append(request_end)
+    return trace
+
+
+class Sessions:
+    """
+    Общие сессии aiohttp для всех
+    проверок ProxiesTaster: по одной
+    сессии (и одному коннектору) на
+    протокол, с общим SSL контекстом,
+    общим кешем DNS и ограничением
+    количества соединений
+
+    .. code-block:: python
+
+        sessions = Sessions(200)
+
+        session = sessions.get(Protocol.HTTP)
+        ...
+        await sessions.close()
+
+    :param limit: Максимальное количество
+        одновременных соединений одной сессии
+    :type limit: int
+    """
+    def __init__(self, limit: int = 200):
+        """
+        Иницилизация пула сессий
+
+        :param limit: Максимальное количество
+            соединений на одну сессию
+        :type limit: int
+        """
+        self.limit = limit
+
+        # Общий SSL контекст, вместо
+        # создания нового на каждый коннектор
+        self.ssl = ssl.create_default_context()
+
+        # Замер времени запросов
+        self.trace = timings_trace()
+
+        # Общий кеш DNS для всех коннекторов
+        self.resolver = CachingResolver()
+
+        # Ограничения времени этапов подключения
+        self.timeouts = Timeouts()
+
+        # Созданные сессии по протоколам
+        self.sessions: dict[Protocol, aiohttp.ClientSession] = {}
+
+    def set_limit(self, limit: int):
+        """
+        Установить ограничение соединений
+        для новых сессий
+
+        :param limit: Максимальное количество соединений
+        :type limit: int
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.limit = limit if limit > 0 else 1
+
+    def set_resolver(self, resolver: CachingResolver):
+        """
+        Установить общий резолвер
+        DNS для новых сессий
+
+        :param resolver: Резолвер с кешем
+        :type resolver: CachingResolver
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.resolver = resolver
+
+    def set_timeouts(self, timeouts: Timeouts):
+        """
+        Установить ограничения времени
+        подключения (в том числе для уже
+        созданных сессий)
+
+        :param timeouts: Ограничения времени
+        :type timeouts: Timeouts
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.timeouts = timeouts
+        for session in self.sessions.values():
+            session.connector.timeouts = timeouts
+
+    def connector(self, protocol: Protocol) -> TCPConnector:
+        """
+        Создать коннектор для протокола
+
+        :param protocol: Протокол прокси
+        :type protocol: Protocol
+
+        :return: Коннектор для сессии
+        :rtype: TCPConnector
+        """
+        if protocol in (Protocol.SOCKS4, Protocol.SOCKS5):
+            # Хост "судьи" резолвится локально
+            # (rdns=False), через общий кеш
+            return SocksConnector(
+                timeouts=self.timeouts,
+                limit=self.limit,
+                ssl=self.ssl,
+                resolver=self.resolver,
+                use_dns_cache=False
+            )
+
+        # HTTP и HTTPS прокси передаются в
+        # каждом запросе, а соединения с
+        # разными прокси не смешиваются.
+        # Хост "судьи" резолвит сам прокси,
+        # а локально - только хост прокси
+        return HttpConnector(
+            timeouts=self.timeouts,
+            limit=self.limit,
+            ssl=self.ssl,
+            resolver=self.resolver,
+            use_dns_cache=False
+        )
+
+    def get(self, protocol: Protocol) -> aiohttp.ClientSession:
+        """
+        Получить (или создать) сессию
+        для протокола. Должно вызываться
+        внутри запущенного event loop
+
+        :param protocol: Протокол прокси
+        :type protocol: Protocol
+
+        :return: Сессия для запросов
+        :rtype: aiohttp.ClientSession
+        """
+        session = self.sessions.get(protocol)
+        if session is None or session.closed:
+            session = self.sessions[protocol] = aiohttp.ClientSession(
+                connector=self.connector(protocol),
+                trace_configs=[self.trace]
+            )
+        return session
+
+    def request_kwargs(
+            self, protocol: Protocol, proxy: ParsedProxy
+    ) -> tuple[dict, Union[Token, None]]:
+        """
+        Параметры запроса через прокси
+        для общей сессии
+
+        Для SOCKS прокси возвращает токен
+        установки `socks_proxy`, который
+        необходимо сбросить после запроса
+
+        :param protocol: Протокол прокси
+        :type protocol: Protocol
+
+        :param proxy: Разобранный прокси
+        :type proxy: ParsedProxy
+
+        :return: Именованные аргументы для запроса
+            и токен `socks_proxy` (либо None)
+        :rtype: tuple[dict, Union[Token, None]]
+        """
+        if protocol in (Protocol.SOCKS4, Protocol.SOCKS5):
+            username, _, password = (proxy.auth or '').partition(':')
+            return {}, socks_proxy.set(
+                (
+                    ProxyType(protocol.value),
+                    proxy.host,
+                    proxy.port,
+                    username,
+                    password
+                )
+            )
+        return {"proxy": f"http://{proxy}"}, None
+
+    async def close(self):
+        """
+        Закрыть все сессии
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions.clear()
+        await self.resolver.close()
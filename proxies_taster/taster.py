@@ -1,26 +1,25 @@
-# Json
-import json
-
 # Union type
 from typing import Any
 from typing import Union
+from typing import Literal
 from typing import Callable
+from typing import Iterable
+from typing import AsyncIterator
 
 # Functools
 import functools
 
-# Asyncio
-import asyncio
+# Itertools
+import itertools
 
-# Events
-from event_emitter import EventEmitter
+# Time
+import time
 
-# UserAgent
-from fake_useragent import UserAgent
+# Asyncio
+import asyncio
 
 # Aiohttp
-import aiohttp
-from aiohttp_proxy import ProxyConnector
+from aiohttp import ClientTimeout
 
 # Exceptoins
 # Aiohttp
@@ -42,8 +41,12 @@ from aiohttp_proxy.errors import SocksError
 # Types
 from .types import Protocol
 from .types import Proxies
+from .types import ProxyDict
+from .types import ParsedProxy
 
 # Dataclasses
+from .types import Timings
+from .types import Timeouts
 from .types import WorkedProxy
 
 # Events
@@ -61,6 +64,45 @@ from .events_data import RunEnd
 # Exceptions
 from .exceptions import TooManyOpenFilesError
 
+# Emitter
+from .emitter import Emitter
+
+# Resolver
+from .resolver import CachingResolver
+
+# Sessions
+from .sessions import Sessions
+from .sessions import socks_proxy
+
+# Headers
+from .headers import HeadersPool
+
+# Judge
+from .judge import Judge
+
+# Cache
+from .cache import ResultsCache
+
+# Journal
+from .journal import Journal
+
+# Concurrency
+from .concurrency import AdaptiveLimiter
+from .concurrency import RESOURCE_ERRORS
+
+# Limits
+from .limits import auto_workers
+from .limits import DESCRIPTORS_PER_WORKER
+from .limits import PROBE_DESCRIPTORS
+
+# Processes
+from .processes import shard
+from .processes import cpu_processes
+
+# Probe
+from .probe import reachable
+from .probe import fingerprint
+
 
 def events_wrap(
         event: str,
@@ -101,33 +143,35 @@ def events_wrap(
         async def myfunc(self, protocol, proxy):
             pass
     """
+    # Названия событий вычисляются один раз
+    start_name = event + '.start'
+    success_name = event + '.success'
+    error_name = event + '.error'
+    end_name = event + '.end'
+
     def _wrapped(func):
-        def start(*args, **kwargs):
-            name = event + '.start'
-            args[0].emitter.emit(
-                name, Start(
-                    name=name,
+        def start(emitter, *args, **kwargs):
+            emitter.emit(
+                start_name, Start(
+                    name=start_name,
                     args=args,
                     kwargs=kwargs
                 )
             )
 
-        def end(result, *args, **kwargs):
-            end_name = event + '.end'
-
+        def end(emitter, result, *args, **kwargs):
             if result:
-                name = event + '.success'
-                args[0].emitter.emit(
-                    name, ProxySuccess(
-                        name=name,
-                        protocol=result.protocol,
-                        proxy=result
+                if emitter.listens(success_name):
+                    emitter.emit(
+                        success_name, ProxySuccess(
+                            name=success_name,
+                            protocol=result.protocol,
+                            proxy=result
+                        )
                     )
-                )
-            else:
-                name = event + '.error'
+            elif emitter.listens('error', error_name):
                 error = ProxyError.create(
-                    name=name,
+                    name=error_name,
                     protocol=args[protocol] if len(args) - 1 >= protocol
                     else kwargs['protocol'] if 'protocol' in kwargs
                     else False,
@@ -135,27 +179,61 @@ def events_wrap(
                     level='not work',
                     message=None
                 )
-                args[0].emitter.emit('error', error)
-                args[0].emitter.emit(name, error)
-
-            args[0].emitter.emit(
-                end_name, End(
-                    name=end_name,
-                    result=result
+                emitter.emit('error', error)
+                emitter.emit(error_name, error)
+
+            if emitter.listens(end_name):
+                emitter.emit(
+                    end_name, End(
+                        name=end_name,
+                        result=result
+                    )
                 )
-            )
 
         @functools.wraps(func)
         async def _async_wrapper(*args, **kwargs):
-            start(*args, **kwargs)
+            # Данные событий создаются, только
+            # если у них есть обработчики
+            emitter = args[0].emitter
+            if emitter.listens(start_name):
+                start(emitter, *args, **kwargs)
             result = await func(*args, **kwargs)
-            end(result, *args, **kwargs)
+            end(emitter, result, *args, **kwargs)
+
+            # Ждем медленные обработчики
+            if emitter.queued:
+                await emitter.wait()
             return result
 
         return _async_wrapper
     return _wrapped
 
 
+def settings_wrap(func):
+    """
+    Декоратор для методов-настроек
+    ProxiesTaster, который запоминает
+    их аргументы в `taster.settings`, чтобы
+    повторить настройки в другом процессе
+    (`ProxiesTaster.set_processes`)
+
+    **Пример работы**
+
+    .. code-block:: python
+
+        @settings_wrap
+        def set_myoption(self, value):
+            self.myoption = value
+    """
+    @functools.wraps(func)
+    def _wrapper(self, *args, **kwargs):
+        # Повторяются в порядке последнего вызова
+        self.settings.pop(func.__name__, None)
+        self.settings[func.__name__] = (args, kwargs)
+        return func(self, *args, **kwargs)
+    return _wrapper
+
+
 class ProxiesTaster:
     """
     Класс который как-раз таки
@@ -217,45 +295,103 @@ class ProxiesTaster:
         InvalidURL
     )
 
-    def __init__(self, proxies: Proxies):
+    def __init__(self, proxies: Union[Proxies, Iterable]):
         """
         Иницилизация класса и
         передача необходимых фильтров
         и параметров
 
-        :param proxies: Список прокси
-        :type proxies: Proxies
+        :param proxies: Список прокси (или любой
+            итерируемый объект, например генератор
+            `proxies_taster.parser.read_proxies`)
+        :type proxies: Union[Proxies, Iterable]
         """
         # Список прокси
         self.proxies = proxies
 
+        # Вызванные настройки (для дочерних процессов)
+        self.settings: dict[str, tuple] = {}
+
+        # Количество процессов
+        self.processes = 1
+
         # Количество асинхронных задач
         self.workers = 200
         self.semaphore = asyncio.Semaphore(self.workers)
 
+        # Выбирать ли количество задач при
+        # запуске проверки (`set_workers('auto')`)
+        self.workers_auto = False
+
+        # Меняется ли количество задач во время работы
+        self.adaptive = False
+
+        # Проверять ли протоколы одновременно
+        self.racing = False
+
+        # Определять ли протокол рукопожатием
+        self.probing = False
+        self.probe_timeout = 5
+
+        # Предварительная проверка TCP подключения
+        self.prefiltering = False
+        self.prefilter_timeout = 1
+        self.prefilter_workers = 2000
+        self.prefilter_semaphore = asyncio.Semaphore(self.prefilter_workers)
+
+        # Ограничения времени этапов проверки
+        self.timeouts = Timeouts()
+        self.client_timeout = ClientTimeout(total=self.timeouts.total)
+
+        # Сохранять ли в результатах
+        # объект ответа и его тело
+        self.keep_response = False
+
+        # Хранилище результатов проверок
+        self.cache: Union[ResultsCache, None] = None
+
+        # Журнал проверки (только в этом процессе)
+        self.journal: Union[Journal, None] = None
+
+        # Общие сессии для проверок, по
+        # одной на каждый протокол
+        self.sessions = Sessions(self.workers)
+
         # Провряемые протоколы
         self.protocols: list[Protocol] = [protocol for protocol in Protocol]
 
-        # Устанавливаем на каждый прокси
-        # рандомные заголовки
-        self.headers = {
-            proxy: {
-                "User-Agent": UserAgent().random,
-                "Accept": "*/*",
-                "Proxy-Connection": "Keep-Alive"
-            } for proxy in proxies
-        }
+        # Сервер, через запрос к
+        # которому проверяются прокси
+        self.judge = Judge()
+
+        # Резолвить ли хост "судьи" один раз
+        self.pin_judge = False
+
+        # Общий набор заголовков со
+        # случайными User-Agent
+        self.headers = HeadersPool()
 
         # Events
-        self.emitter = EventEmitter()
+        self.emitter = Emitter()
 
-    def set_workers(self, workers: int):
+    @settings_wrap
+    def set_workers(self, workers: Union[int, Literal['auto']]):
         """
         Установить количество асинхронных
         задач "воркеров"
 
+        Значение 'auto' поднимает мягкий лимит
+        открытых файлов до жесткого и выбирает
+        максимальное безопасное количество
+        по нему и по количеству локальных портов.
+        Окончательно оно выбирается при запуске
+        проверки, с учетом настроенных к этому
+        времени предварительной проверки,
+        определения протокола и количества
+        процессов (порты делятся между ними)
+
         :param workers: Количество асинхронных задач
-        :type workers: int
+        :type workers: Union[int, Literal['auto']]
 
         :return: Ничего не возвращает
         :rtype: None
@@ -265,10 +401,382 @@ class ProxiesTaster:
         .. code-block:: python
 
             taster.set_workers(300)
+
+            # Или
+            taster.set_workers('auto')
+        """
+        self.workers_auto = workers == 'auto'
+        self.limit_workers(
+            self.estimate_workers() if self.workers_auto else workers
+        )
+
+    def limit_workers(self, workers: int):
+        """
+        Применить количество "воркеров"
+        (без запоминания в `settings`)
+
+        :param workers: Количество асинхронных задач
+        :type workers: int
+
+        :return: Ничего не возвращает
+        :rtype: None
         """
         self.workers = workers if workers > 0 else 1
-        self.semaphore = asyncio.Semaphore(self.workers)
+        if self.adaptive:
+            self.semaphore.set_limit(self.workers)
+        else:
+            self.semaphore = asyncio.Semaphore(self.workers)
+            self.sessions.set_limit(self.workers)
+
+    def estimate_workers(self, processes: int = 1) -> int:
+        """
+        Безопасное количество "воркеров"
+        одного процесса при текущих
+        настройках (для `set_workers('auto')`)
+
+        :param processes: Количество процессов,
+            между которыми делятся локальные порты
+        :type processes: int
+
+        :return: Количество "воркеров"
+        :rtype: int
+        """
+        return auto_workers(
+            extra=self.prefilter_workers if self.prefiltering else 0,
+            per_worker=DESCRIPTORS_PER_WORKER + (
+                PROBE_DESCRIPTORS if self.probing else 0
+            ),
+            processes=processes
+        )
+
+    def resolve_workers(self):
+        """
+        Выбрать количество "воркеров" 'auto'
+        по настройкам на момент запуска
+        проверки (настройки, от которых оно
+        зависит, могут быть заданы позже
+        `set_workers`)
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if self.workers_auto:
+            self.limit_workers(self.estimate_workers())
+
+    @settings_wrap
+    def set_adaptive(self, adaptive: bool = True, **options):
+        """
+        Включить (или выключить) адаптивное
+        количество "воркеров": лимит растет,
+        пока проверки идут нормально, и
+        уменьшается при нехватке ресурсов
+        (Too many open files и т.д.), росте
+        доли ошибок или задержке event loop.
+        При нехватке ресурсов проверка прокси
+        повторяется, а не прерывает всю работу
+
+        Текущее количество "воркеров"
+        становится начальным лимитом
+
+        :param adaptive: Менять ли лимит во время работы
+        :type adaptive: bool
+
+        :param options: Параметры `AdaptiveLimiter`
+            (minimum, maximum, step, factor и т.д.)
+        :type options: dict
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            taster.set_workers(200)
+            taster.set_adaptive(True, maximum=5000)
+        """
+        if adaptive:
+            # Обработчики регистрируются один раз и
+            # передают результаты текущему лимитеру
+            if not self.adaptive:
+                for name in ('except.success', 'except.error.skipped'):
+                    self.emitter.on(name, self.observe)
+
+            self.semaphore = AdaptiveLimiter(self.workers, **options)
+            self.sessions.set_limit(self.semaphore.maximum)
+        else:
+            self.semaphore = asyncio.Semaphore(self.workers)
+            self.sessions.set_limit(self.workers)
+
+        self.adaptive = adaptive
+
+    def observe(self, event: Union[ProxySuccess, ProxyError]):
+        """
+        Передать результат попытки
+        адаптивному лимитеру (обработчик
+        событий 'except.success' и
+        'except.error.skipped')
+
+        :param event: Данные события
+        :type event: Union[ProxySuccess, ProxyError]
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if self.adaptive:
+            self.semaphore.observe(event)
+
+    @settings_wrap
+    def set_racing(self, racing: bool = True):
+        """
+        Включить (или выключить) одновременную
+        проверку всех протоколов прокси,
+        вместо их перебора по очереди
+
+        :param racing: Проверять ли протоколы одновременно
+        :type racing: bool
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            taster.set_racing(True)
+        """
+        self.racing = racing
+
+    @settings_wrap
+    def set_probing(self, probing: bool = True, timeout: float = 5):
+        """
+        Включить (или выключить) определение
+        протокола прокси рукопожатием перед
+        проверкой, после чего проверяется
+        только найденный протокол
+
+        :param probing: Определять ли протокол рукопожатием
+        :type probing: bool
+
+        :param timeout: Время ожидания определения
+            протокола одного прокси
+        :type timeout: float
 
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            taster.set_probing(True, 3)
+        """
+        self.probing = probing
+        self.probe_timeout = timeout
+
+    @settings_wrap
+    def set_prefilter(
+            self,
+            prefiltering: bool = True,
+            timeout: float = 1,
+            workers: int = 2000
+    ):
+        """
+        Включить (или выключить) предварительную
+        проверку TCP подключения к прокси: не
+        принимающие соединения прокси
+        отбрасываются без полной проверки
+
+        :param prefiltering: Проверять ли подключение
+        :type prefiltering: bool
+
+        :param timeout: Время ожидания подключения
+        :type timeout: float
+
+        :param workers: Количество одновременных подключений
+        :type workers: int
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            taster.set_prefilter(True, 0.5, 5000)
+        """
+        self.prefiltering = prefiltering
+        self.prefilter_timeout = timeout
+        self.prefilter_workers = workers if workers > 0 else 1
+        self.prefilter_semaphore = asyncio.Semaphore(self.prefilter_workers)
+
+    def set_processes(self, processes: Union[int, Literal['auto']]):
+        """
+        Проверять прокси в нескольких процессах:
+        прокси делятся между процессами пачками,
+        у каждого свой event loop и свой
+        ProxiesTaster с теми же настройками
+        (поэтому настройки должны передаваться
+        в другой процесс, например "судья" без
+        лямбды в `matcher`)
+
+        Количество "воркеров" задается для
+        каждого процесса. Рабочие прокси и
+        события, у которых есть обработчики,
+        передаются в этот процесс, а общие
+        счетчики - событием `Events.progress`.
+        Объект ответа в результатах не передается
+
+        :param processes: Количество процессов,
+            либо 'auto' - по количеству ядер
+        :type processes: Union[int, Literal['auto']]
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            taster.set_processes(8)
+            taster.on(
+                Events.progress,
+                lambda event: print(event.checked, event.worked)
+            )
+            result = await taster.run()
+        """
+        if processes == 'auto':
+            processes = cpu_processes()
+        self.processes = processes if processes > 0 else 1
+
+    @settings_wrap
+    def set_judge(self, judge: Union[Judge, str]):
+        """
+        Установить сервер ("судью"), через
+        запрос к которому проверяются прокси
+        (по-умолчанию ipinfo.io)
+
+        :param judge: "Судья" или его адрес
+        :type judge: Union[Judge, str]
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            from proxies_taster.judge import Judge
+
+            taster.set_judge('http://10.0.0.2:8080/')
+
+            # Или
+            taster.set_judge(
+                Judge(
+                    url='http://10.0.0.2:8080/',
+                    matcher=lambda body: 'ip' in body
+                )
+            )
+        """
+        self.judge = Judge.from_url(judge) if isinstance(
+            judge, str
+        ) else judge
+
+        if self.pin_judge:
+            self.sessions.resolver.pin(*self.judge.hosts())
+
+    @settings_wrap
+    def set_resolver(
+            self,
+            ttl: float = 60,
+            pin_judge: bool = False,
+            hosts: Union[dict[str, list[str]], None] = None
+    ):
+        """
+        Настроить общий для всех сессий
+        кеш DNS (`CachingResolver`)
+
+        Через SOCKS прокси хост "судьи"
+        резолвится локально и берется из
+        кеша, а через HTTP(S) прокси его
+        резолвит сам прокси, поэтому
+        локально резолвятся только хосты
+        прокси, указанных по имени
+
+        :param ttl: Время жизни записей (в секундах)
+        :type ttl: float
+
+        :param pin_judge: Резолвить хост "судьи" один
+            раз и не обновлять до конца работы
+        :type pin_judge: bool
+
+        :param hosts: Заранее известные адреса хостов
+            (DNS для них не запрашивается)
+        :type hosts: Union[dict[str, list[str]], None]
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            taster.set_resolver(ttl=300, pin_judge=True)
+
+            # Или с уже известным адресом "судьи"
+            taster.set_resolver(hosts={'ipinfo.io': ['34.117.59.81']})
+        """
+        self.sessions.set_resolver(CachingResolver(ttl, hosts))
+        self.pin_judge = pin_judge
+
+        if pin_judge:
+            self.sessions.resolver.pin(*self.judge.hosts())
+
+    @settings_wrap
+    def set_timeouts(
+            self,
+            timeouts: Union[Timeouts, None] = None,
+            **limits: Union[float, None]
+    ):
+        """
+        Установить отдельные ограничения
+        времени этапов проверки: TCP
+        подключения к прокси, рукопожатия
+        (SOCKS или CONNECT), TLS с "судьей",
+        ожидания ответа и всего запроса
+
+        По-умолчанию ограничен только
+        весь запрос (10 секунд)
+
+        :param timeouts: Ограничения времени
+        :type timeouts: Union[Timeouts, None]
+
+        :param limits: Или отдельные ограничения
+            (поля `Timeouts`)
+        :type limits: Union[float, None]
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            from proxies_taster import Timeouts
+
+            taster.set_timeouts(Timeouts(connect=2, handshake=3, total=15))
+
+            # Или
+            taster.set_timeouts(connect=2, read=5)
+        """
+        self.timeouts = timeouts or Timeouts(**limits)
+        self.client_timeout = ClientTimeout(
+            total=self.timeouts.total,
+            sock_read=self.timeouts.read
+        )
+        self.sessions.set_timeouts(self.timeouts)
+
+    @settings_wrap
     def set_protocols(
             self, protocols: Union[Protocol, list[Protocol]]
     ):
@@ -301,17 +809,39 @@ class ProxiesTaster:
     def on(
             self,
             event: Events,
-            listener: Callable[[Event], Any]
+            listener: Callable[[Event], Any],
+            batch: Union[int, None] = None,
+            interval: float = 1,
+            buffer: int = 10000
     ):
         """
         Установить обработчик события
 
+        Обычные функции вызываются сразу, а
+        `async def` функции и обработчики
+        пачек (`batch`) получают события через
+        буфер в отдельной задаче и не
+        останавливают проверки. Если буфер
+        заполнен - проверки ждут обработчик
+
         :param event: Название события
         :type event: Events
 
         :param listener: Обработчик этого события
+            (или списка событий, если указан `batch`)
         :type listener: Callable[[Event], None]
 
+        :param batch: Передавать события пачками
+            до `batch` штук
+        :type batch: Union[int, None]
+
+        :param interval: Сколько ждать заполнения
+            пачки (в секундах)
+        :type interval: float
+
+        :param buffer: Размер буфера событий
+        :type buffer: int
+
         :return: Ничего не возвращает
         :rtype: None
 
@@ -333,14 +863,188 @@ class ProxiesTaster:
 
             # Или функцию
             taster.on(Events.check, print_data)
+
+            # Асинхронный обработчик пачек: до 500
+            # событий, либо все, что пришло за секунду
+            async def save(events):
+                await db.insert_many(event.proxy for event in events)
+
+            taster.on(Events.check_success, save, batch=500, interval=1)
+        """
+        self.emitter.on(event.value, listener, batch, interval, buffer)
+
+    def parse(
+            self,
+            proxy: Union[str, ProxyDict, ParsedProxy],
+            name: str = 'check.error',
+            protocol: Union[Protocol, False] = False
+    ) -> Union[ParsedProxy, False]:
+        """
+        Разбирает и проверяет прокси,
+        при неправильном формате вызывает
+        событие ошибки
+
+        :param proxy: Прокси в любом из
+            поддерживаемых форматов
+        :type proxy: Union[str, ProxyDict, ParsedProxy]
+
+        :param name: Название события ошибки
+        :type name: str
+
+        :param protocol: Протокол, по которому
+            проверяется прокси
+        :type protocol: Union[Protocol, False]
+
+        :return: Разобранный прокси, либо False
+        :rtype: Union[ParsedProxy, False]
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            proxy = taster.parse('socks5://91.121.52.213:55348')
         """
-        self.emitter.on(event.value, listener)
+        try:
+            return ParsedProxy.parse(proxy)
+        except (ValueError, AttributeError) as err:
+            if self.emitter.listens('error', name):
+                error = ProxyError.create(
+                    name=name,
+                    protocol=protocol,
+                    proxy=proxy,
+                    level='error',
+                    message=str(err),
+                    exception=err
+                )
+                self.emitter.emit('error', error)
+                self.emitter.emit(name, error)
+            return False
+
+    @settings_wrap
+    def set_keep_response(self, keep: bool = True):
+        """
+        Сохранять ли в результатах (`WorkedProxy`)
+        объект ответа и тело ответа "судьи"
+
+        По-умолчанию сохраняются только код
+        ответа, ip, страна и время проверки,
+        чтобы не держать в памяти ответы
+        всех рабочих прокси
+
+        :param keep: Сохранять ли ответ
+        :type keep: bool
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            taster.set_keep_response()
+            worked = await taster.run()
+            worked[0].body  # {'ip': ..., 'country': ..., ...}
+        """
+        self.keep_response = keep
+
+    @settings_wrap
+    def set_cache(self, cache: Union[ResultsCache, None]):
+        """
+        Установить хранилище результатов
+        проверок: недавно не работавшие
+        прокси пропускаются, а для недавно
+        работавших сразу проверяется
+        известный протокол
+
+        :param cache: Хранилище результатов (None - отключить)
+        :type cache: Union[ResultsCache, None]
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            from proxies_taster.cache import ResultsCache
+
+            taster.set_cache(ResultsCache('results.sqlite', ttl=3600))
+        """
+        self.cache = cache
+
+    def set_journal(self, journal: Union[Journal, None]):
+        """
+        Установить журнал проверки: прокси,
+        которые уже есть в журнале, не
+        проверяются, а результаты новых
+        проверок дописываются в него
+
+        Рабочие прокси из журнала заново
+        не отдаются - они доступны в
+        `journal.worked`
+
+        :param journal: Журнал (None - отключить)
+        :type journal: Union[Journal, None]
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            from proxies_taster.journal import Journal
+
+            journal = Journal('run.journal', resume=True)
+            taster.set_journal(journal)
+        """
+        self.journal = journal
+
+    async def close(self):
+        """
+        Закрыть общие сессии, через которые
+        проверяются прокси. Вызывается
+        автоматически в конце `run`, а при
+        ручном вызове `check` или `exc`
+        необходимо вызвать самостоятельно
+        (либо использовать `async with`)
+
+        :return: Ничего не возвращает
+        :rtype: None
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            async with ProxiesTaster(proxies) as taster:
+                result = await taster.check('107.174.66.231:36626')
+        """
+        await self.sessions.close()
+
+        # Останавливаем замер задержки event loop
+        if self.adaptive:
+            await self.semaphore.close()
+
+        # Сохраняем оставшиеся результаты
+        if self.cache:
+            self.cache.flush()
+        if self.journal:
+            self.journal.flush()
+
+        # Передаем обработчикам оставшиеся события
+        await self.emitter.flush()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
 
     @events_wrap('except', 1, 2)
     async def exc(
             self,
             protocol: Protocol,
-            proxy: str,
+            proxy: Union[str, ParsedProxy],
     ) -> Union[WorkedProxy, False]:
         """
         Делает запрос через aiohttp
@@ -351,7 +1055,7 @@ class ProxiesTaster:
         :type protocol: Protocol
 
         :param proxy: Сам прокси
-        :type proxy: str
+        :type proxy: Union[str, ParsedProxy]
 
         :return: Возвращает либо
             проверенный прокси, либо False
@@ -367,168 +1071,146 @@ class ProxiesTaster:
                 Protocol.SOCKS4, '107.174.66.231:36626'
             )
         """
-        # Обрабатываем переданный прокси
-        proxy = next(iter(proxy.split('://')), 1) or proxy
-
-        # Разделяем строку прокси, для проверки валидности
-        splitted_proxy = proxy.split("@")
-        len_splitted_proxy = len(splitted_proxy)
-
-        # Если общий формат неправильный, то возвращаем ошибку
-        try:
-            if len_splitted_proxy == 1:
-                port = splitted_proxy[0].split(":")[1]
-            elif len_splitted_proxy == 2:
-                port = splitted_proxy[1].split(":")[1]
-        except Exception:
-            error = ProxyError.create(
-                name='except.error',
-                protocol=protocol,
-                proxy=proxy,
-                level='error',
-                message=f"Invalid format proxy '{proxy}'"
-            )
-            self.emitter.emit('error', error)
-            self.emitter.emit('except.error', error)
-
+        # Разбираем прокси, если он не
+        # был разобран при получении
+        if not (proxy := self.parse(proxy, 'except.error', protocol)):
             return False
 
-        # Если порт неправильный, то возвращаем ошибку
-        try:
-            port = int(port)
-        except Exception:
-            error = ProxyError.create(
-                name='except.error',
-                protocol=protocol,
-                proxy=proxy,
-                level='error',
-                message=' '.join(
-                    [
-                        'Error converted proxy port from string to',
-                        f"integer value. Port: '{port}'"
-                    ]
+        # Без https адреса "судьи" HTTPS прокси
+        # проверился бы как HTTP
+        if not self.judge.supports(protocol):
+            if self.emitter.listens(
+                    'error', 'except.error', 'except.error.skipped'
+            ):
+                error = ProxyError.create(
+                    name='except.error.skipped',
+                    protocol=protocol,
+                    proxy=proxy,
+                    level='skipped',
+                    message='Judge has no https url to check HTTPS proxies'
                 )
-            )
-            self.emitter.emit('error', error)
-            self.emitter.emit('except.error', error)
-            return False
-
-        # Если порт не входит в диапазон поддерживаемых
-        if port >= 65535:
-            error = ProxyError.create(
-                name='except.error',
-                protocol=protocol,
-                proxy=proxy,
-                level='error',
-                message=f"Port value '{port}' must be in range 0-65535"
-            )
-            self.emitter.emit('error', error)
-            self.emitter.emit('except.error', error)
+                self.emitter.emit('error', error)
+                self.emitter.emit('except.error', error)
+                self.emitter.emit('except.error.skipped', error)
             return False
 
-        # Продолжаем проверку прокси
-        async with aiohttp.ClientSession(
-                # В зависимости от протокола, разные способ
-                # использования прокси
-                **{} if protocol == Protocol.HTTP else {
-                    "connector": ProxyConnector.from_url(
-                        f"{protocol.value}://{proxy}"
-                    )
-                }
-        ) as session:
+        # Продолжаем проверку прокси через
+        # общую для протокола сессию
+        session = self.sessions.get(protocol)
+        proxy_kwargs, token = self.sessions.request_kwargs(protocol, proxy)
+        timings = Timings()
+        started = time.monotonic()
+        try:
             try:
-                # Общие параметры для прокси
-                kwargs = {
-                    "headers": self.headers[proxy],
-                    "timeout": 10
-                }
-
-                # Получаем ответ от сервера
-                url = protocol.value
-                url = 'https' if 'socks' in url else url
-                url = f"{url}://ipinfo.io/json"
+                # Получаем ответ от "судьи"
                 response = await session.get(
-                    *[url],
-                    # В зависимости от протокола, разные способ
-                    # использования прокси
-                    **kwargs if protocol != Protocol.HTTP else {
-                        **kwargs, **{
-                            "proxy": f"{protocol.value}://{proxy}"
-                        }
-                    }
+                    self.judge.url_for(protocol),
+                    headers=self.headers.get(),
+                    timeout=self.client_timeout,
+                    trace_request_ctx=timings,
+                    **proxy_kwargs
                 )
             except ProxiesTaster.errors as err:
                 message = str(err)
-                if 'Too many open files' in message:
+                if getattr(err, 'errno', None) in RESOURCE_ERRORS \
+                        or 'Too many open files' in message:
                     message = f"Proxy: {proxy}, " \
                         + f"Protocol: {protocol} " \
                         + '[Too many open files]'
                     raise TooManyOpenFilesError(message, err);
-                error = ProxyError.create(
-                    name='except.error.skipped',
-                    protocol=protocol,
-                    proxy=proxy,
-                    level='skipped',
-                    message=message,
-                    exception=err
-                );
-                self.emitter.emit('error', error)
-                self.emitter.emit('except.error', error)
-                self.emitter.emit('except.error.skipped', error)
-            except AttributeError as err:
-                # Выделяем определенную ошибку, которая возникает
-                # при неправильной работе прокси (AttributeError) и
-                # блокируем вывод исключеыния для него
-                if str(err) == "'NoneType' object has no attribute 'get_extra_info'":
+                if self.emitter.listens(
+                        'error', 'except.error', 'except.error.skipped'
+                ):
                     error = ProxyError.create(
-                        name='except.error',
+                        name='except.error.skipped',
                         protocol=protocol,
                         proxy=proxy,
-                        level='error',
-                        message=str(err),
+                        level='skipped',
+                        message=message,
                         exception=err
-                    )
+                    );
                     self.emitter.emit('error', error)
                     self.emitter.emit('except.error', error)
+                    self.emitter.emit('except.error.skipped', error)
+            except AttributeError as err:
+                # Выделяем определенную ошибку, которая возникает
+                # при неправильной работе прокси (AttributeError) и
+                # блокируем вывод исключеыния для него
+                if str(err) == "'NoneType' object has no attribute 'get_extra_info'":
+                    if self.emitter.listens('error', 'except.error'):
+                        error = ProxyError.create(
+                            name='except.error',
+                            protocol=protocol,
+                            proxy=proxy,
+                            level='error',
+                            message=str(err),
+                            exception=err
+                        )
+                        self.emitter.emit('error', error)
+                        self.emitter.emit('except.error', error)
                     return False
 
                 # Иначе просто выводим исключыение
                 raise err
             else:
                 try:
-                    body = await response.text()
+                    # Читается только нужная
+                    # "судье" часть ответа
+                    body = await self.judge.read(response)
+                    timings.total = time.monotonic() - started
                 except ProxiesTaster.errors:
                     pass
                 else:
-                    try:
-                        body = json.loads(body)
-                    except ValueError:
-                        pass
-                    finally:
-                        worked = WorkedProxy(
-                            url=f"{protocol.value}://{proxy}",
-                            protocol=protocol,
-                            proxy=proxy,
-                            response=response,
-                            status=response.status,
-                            body=body,
-                            country=body['country'] if "country" in body
-                            else False
-                        )
-                        self.emitter.emit(
-                            'except.success', ProxySuccess(
-                                name='except.success',
+                    # Ответ не подходит "судье" (например
+                    # прокси подменяет страницу)
+                    if not self.judge.accepts(response.status, body):
+                        if self.emitter.listens(
+                                'error', 'except.error', 'except.error.skipped'
+                        ):
+                            error = ProxyError.create(
+                                name='except.error.skipped',
                                 protocol=protocol,
-                                proxy=worked,
+                                proxy=proxy,
+                                level='skipped',
+                                message=' '.join(
+                                    [
+                                        'Judge rejected response with',
+                                        f"status {response.status}"
+                                    ]
+                                )
                             )
-                        )
-                        return worked
+                            self.emitter.emit('error', error)
+                            self.emitter.emit('except.error', error)
+                            self.emitter.emit('except.error.skipped', error)
+                        return False
+
+                    worked = WorkedProxy(
+                        url=f"{protocol.value}://{proxy}",
+                        protocol=protocol,
+                        proxy=str(proxy),
+                        status=response.status,
+                        country=self.judge.field(body, self.judge.country),
+                        ip=self.judge.field(body, self.judge.ip),
+                        timings=timings,
+                        response=response if self.keep_response else None,
+                        body=body if self.keep_response else None
+                    )
+
+                    # Событие 'except.success'
+                    # отправляет events_wrap
+                    return worked
+                finally:
+                    # Возвращаем соединение в общий коннектор
+                    response.release()
+        finally:
+            if token is not None:
+                socks_proxy.reset(token)
         return False
 
     @events_wrap('check', 2, 1)
     async def check(
             self,
-            proxy: str,
+            proxy: Union[str, ProxyDict, ParsedProxy],
             protocol: Union[Protocol, False] = False
     ) -> Union[WorkedProxy, False]:
         """
@@ -541,13 +1223,13 @@ class ProxiesTaster:
         работоспособность
 
         :param proxy: Сам прокси ip:port
-        :type proxy: str
+        :type proxy: Union[str, ProxyDict, ParsedProxy]
 
         :param protocol: Протокол по которому проверять прокси
         :type protocol: Union[Protocol, False]
 
         :return: Если успешно - выдает протокол, прокси
-         и расположение (результат ответа от ipinfo.io)
+         и расположение (результат ответа от "судьи")
         :rtype: Union[WorkedProxy, False]
 
         **Пример работы**
@@ -568,26 +1250,358 @@ class ProxiesTaster:
             # в самой строке прокси
             result = await taster.check('socks4://107.174.66.231:36626')
         """
-        async with self.semaphore:
-            # Если был передан протокол
-            if protocol and protocol in self.protocols:
+        # Разбираем прокси один раз, дальше
+        # передается уже разобранный прокси
+        if not (proxy := self.parse(proxy)):
+            return False
+
+        # Результат недавней проверки
+        # по тому же протоколу
+        requested = protocol or proxy.protocol
+        if self.cache and (
+                record := self.cache.get(str(proxy), requested)
+        ):
+            # Недавно не работавший прокси
+            if not record.alive:
+                return False
+
+            # Сразу проверяем известный протокол
+            protocol = protocol or record.protocol
+
+        # При адаптивном лимите нехватка
+        # ресурсов не прерывает работу: лимит
+        # уже уменьшен, повторяем проверку
+        # с нарастающей паузой
+        for attempt in range(
+                self.semaphore.retries + 1 if self.adaptive else 1
+        ):
+            try:
+                result = await self.detect(proxy, protocol)
+                break
+            except TooManyOpenFilesError as err:
+                if not self.adaptive:
+                    raise
+
+                if attempt == self.semaphore.retries:
+                    if self.emitter.listens('error', 'check.error'):
+                        error = ProxyError.create(
+                            name='check.error',
+                            protocol=protocol,
+                            proxy=proxy,
+                            level='error',
+                            message=str(err),
+                            exception=err
+                        )
+                        self.emitter.emit('error', error)
+                        self.emitter.emit('check.error', error)
+                    return False
+
+                # Даем освободиться сокетам
+                # остальных проверок
+                await asyncio.sleep(self.semaphore.interval * (attempt + 1))
+
+        if self.cache:
+            self.cache.put(
+                str(proxy),
+                bool(result),
+                result.protocol if result else None,
+                result.timings.total if result else None,
+                requested
+            )
+
+        return result
+
+    async def detect(
+            self,
+            proxy: ParsedProxy,
+            protocol: Union[Protocol, False] = False
+    ) -> Union[WorkedProxy, False]:
+        """
+        Определяет протокол разобранного
+        прокси и проверяет его (без событий
+        `check` и без хранилища результатов)
+
+        :param proxy: Разобранный прокси
+        :type proxy: ParsedProxy
+
+        :param protocol: Протокол по которому проверять прокси
+        :type protocol: Union[Protocol, False]
+
+        :return: Рабочий прокси, либо False
+        :rtype: Union[WorkedProxy, False]
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            result = await taster.detect(
+                ParsedProxy.parse('107.174.66.231:36626')
+            )
+        """
+        # Отбрасываем не принимающие соединения
+        # прокси до основной проверки
+        if self.prefiltering and not await self.reachable(proxy):
+            return False
+
+        # Если был передан протокол
+        if protocol and protocol in self.protocols:
+            async with self.semaphore:
                 return await self.exc(protocol, proxy)
 
-            # Если протокол был передан в строке
-            if (protocol := proxy.split('://'))[0] in [
-                protocol.value for
-                protocol in self.protocols
-            ]:
-                return await self.exc(Protocol(protocol), proxy)
+        # Если протокол был передан вместе с прокси
+        if proxy.protocol in self.protocols:
+            async with self.semaphore:
+                return await self.exc(proxy.protocol, proxy)
+
+        # Определяем протокол по первым байтам
+        # ответа и проверяем только его
+        if self.probing:
+            async with self.semaphore:
+                if protocol := await self.probe(proxy):
+                    return await self.exc(protocol, proxy)
+                return False
+
+        # Проверяем все протоколы одновременно
+        if self.racing and len(self.judged_protocols()) > 1:
+            return await self.race(proxy)
 
+        async with self.semaphore:
             # Перебираем доступные прокси
-            for protocol in self.protocols:
+            for protocol in self.judged_protocols():
                 if result := await self.exc(protocol, proxy):
                     return result
 
             # Если прокси не работает
             return False
 
+    def judged_protocols(self) -> list[Protocol]:
+        """
+        Определяемые протоколы, которые
+        можно проверить через "судью"
+        (`Judge.supports`)
+
+        :return: Протоколы
+        :rtype: list[Protocol]
+        """
+        return [
+            protocol for protocol in self.protocols
+            if self.judge.supports(protocol)
+        ]
+
+    async def probe(self, proxy: ParsedProxy) -> Union[Protocol, False]:
+        """
+        Определяет протокол прокси
+        короткими рукопожатиями (не дольше
+        `probe_timeout` на прокси), без
+        полноценного HTTP запроса
+
+        :param proxy: Разобранный прокси
+        :type proxy: ParsedProxy
+
+        :return: Протокол прокси, либо False
+        :rtype: Union[Protocol, False]
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            protocol = await taster.probe(
+                ParsedProxy.parse('107.174.66.231:36626')
+            )
+        """
+        try:
+            host = await self.sessions.resolver.address(proxy.host)
+        except OSError:
+            return False
+
+        return await fingerprint(
+            host, proxy.port, self.judged_protocols(),
+            self.probe_timeout, self.judge.target(), proxy.auth
+        )
+
+    async def reachable(self, proxy: ParsedProxy) -> bool:
+        """
+        Предварительная проверка: принимает
+        ли прокси TCP соединения. Использует
+        свой (больший) лимит одновременных
+        подключений и короткое время ожидания
+
+        :param proxy: Разобранный прокси
+        :type proxy: ParsedProxy
+
+        :return: Удалось ли подключиться
+        :rtype: bool
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            if await taster.reachable(
+                ParsedProxy.parse('107.174.66.231:36626')
+            ):
+                ...
+        """
+        async with self.prefilter_semaphore:
+            try:
+                host = await self.sessions.resolver.address(proxy.host)
+            except OSError:
+                return False
+
+            return await reachable(host, proxy.port, self.prefilter_timeout)
+
+    async def race(self, proxy: ParsedProxy) -> Union[WorkedProxy, False]:
+        """
+        Проверяет прокси сразу по всем
+        протоколам одновременно и возвращает
+        первый успешный результат, отменяя
+        остальные проверки
+
+        Каждая попытка занимает одного
+        "воркера", поэтому общее количество
+        одновременных запросов не меняется
+
+        :param proxy: Разобранный прокси
+        :type proxy: ParsedProxy
+
+        :return: Рабочий прокси, либо False
+        :rtype: Union[WorkedProxy, False]
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            result = await taster.race(
+                ParsedProxy.parse('107.174.66.231:36626')
+            )
+        """
+        async def attempt(protocol: Protocol):
+            async with self.semaphore:
+                return await self.exc(protocol, proxy)
+
+        tasks = [
+            asyncio.ensure_future(attempt(protocol))
+            for protocol in self.judged_protocols()
+        ]
+        try:
+            for future in asyncio.as_completed(tasks):
+                if result := await future:
+                    return result
+
+            # Если прокси не работает
+            return False
+        finally:
+            # Отменяем проигравшие проверки
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def window(self) -> int:
+        """
+        Количество одновременно запущенных
+        задач по-умолчанию: удвоенное количество
+        "воркеров" (или максимального адаптивного
+        лимита) плюс лимит предварительной проверки
+
+        :return: Размер окна задач
+        :rtype: int
+        """
+        workers = self.semaphore.maximum if self.adaptive else self.workers
+        return workers * 2 + (
+            self.prefilter_workers if self.prefiltering else 0
+        )
+
+    async def stream(
+            self,
+            proxies: Union[Iterable, None] = None,
+            window: Union[int, None] = None
+    ) -> AsyncIterator[WorkedProxy]:
+        """
+        Проверяет прокси и отдает рабочие
+        сразу, как только они были проверены
+
+        Одновременно запущено не больше
+        `window` задач, поэтому память
+        не растет вместе со списком прокси.
+        Порядок результатов соответствует
+        порядку окончания проверок
+
+        Если установлено несколько процессов
+        (`set_processes`), прокси проверяются
+        в них, а `window` не учитывается
+
+        :param proxies: Прокси для проверки (любой
+            итерируемый объект), по-умолчанию
+            переданные при иницилизации
+        :type proxies: Union[Iterable, None]
+
+        :param window: Количество одновременно
+            запущенных задач, по-умолчанию
+            удвоенное количество "воркеров" (или
+            максимального адаптивного лимита) плюс
+            лимит предварительной проверки
+        :type window: Union[int, None]
+
+        :return: Асинхронный генератор рабочих прокси
+        :rtype: AsyncIterator[WorkedProxy]
+
+        **Пример работы**
+
+        .. code-block:: python
+
+            async for worked in taster.stream():
+                print(worked.url)
+        """
+        proxies = iter(self.proxies if proxies is None else proxies)
+
+        # Пропускаем уже проверенные
+        journal = self.journal
+        if journal:
+            proxies = journal.pending(proxies)
+
+        # Проверка в нескольких процессах
+        if self.processes > 1:
+            try:
+                async for worked in shard(self, proxies, self.processes):
+                    yield worked
+            finally:
+                await self.close()
+            return
+
+        # 'auto' по окончательным настройкам
+        self.resolve_workers()
+        window = window if window and window > 0 else self.window()
+
+        # Задача проверки -> прокси
+        pending: dict[asyncio.Task, Any] = {}
+        try:
+            while True:
+                # Дополняем окно новыми проверками
+                for proxy in itertools.islice(
+                        proxies, window - len(pending)
+                ):
+                    pending[asyncio.ensure_future(self.check(proxy))] = proxy
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    proxy = pending.pop(task)
+                    result = task.result()
+                    if journal:
+                        journal.record(proxy, result)
+                    if result:
+                        yield result
+        finally:
+            # Останавливаем оставшиеся проверки, если
+            # генератор был закрыт раньше времени
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await self.close()
+
     async def run(self) -> list[WorkedProxy]:
         """
         Запускает весь процесс проверки
@@ -609,19 +1623,13 @@ class ProxiesTaster:
                 workers=self.workers
             )
         )
-        # Фильтруем и получаем
-        # только рабочие прокси
-        result = filter(
-            None, await asyncio.gather(
-                *[asyncio.ensure_future(
-                    self.check(proxy)
-                ) for proxy in self.proxies]
-            )
-        )
+        # Получаем только рабочие прокси
+        result = [worked async for worked in self.stream()]
         self.emitter.emit(
             'run.end', RunEnd(
                 name='run.end',
                 proxies=result
             )
         )
+        await self.emitter.flush()
         return result
@@ -0,0 +1,256 @@
+# Typing
+from typing import Union
+from typing import Literal
+from typing import Callable
+
+# Standarts
+import io
+import os
+import csv
+import json
+import time
+
+# Types
+from .types import WorkedProxy
+
+
+Format = Literal['plain', 'jsonl', 'csv']
+"""Формат файла с рабочими прокси: plain - по
+строке на прокси, jsonl - json со всеми полями,
+csv - таблица с заголовком"""
+
+FORMATS = ('plain', 'jsonl', 'csv')
+"""Доступные значения `Format`"""
+
+CSV_FIELDS = (
+    'url', 'protocol', 'proxy', 'status', 'country',
+    'ip', 'connect', 'ttfb', 'total'
+)
+"""Колонки csv файла"""
+
+
+class ResultsWriter:
+    """
+    Запись рабочих прокси в файл сразу
+    по мере проверки, чтобы при падении
+    программы найденные прокси не терялись
+
+    Каждая запись сразу передается
+    системе (файл можно читать, например
+    `tail -f`, во время проверки), а на
+    диск сбрасывается (`fsync`) каждые
+    `batch` записей или `interval` секунд
+
+    Новый файл пишется во временный
+    `<path>.part` и переименовывается в
+    `path` при закрытии (`close`), поэтому
+    прошлый результат не портится
+    незаконченной проверкой; при
+    дописывании (`append`) строки
+    добавляются прямо в конец файла
+
+    .. code-block:: python
+
+        writer = ResultsWriter('valid.jsonl', 'jsonl')
+        async for worked in taster.stream():
+            writer.write(worked)
+        writer.close()
+
+    :param path: Путь до файла
+    :type path: str
+
+    :param format: Формат файла
+    :type format: Format
+
+    :param append: Дописывать в конец файла
+    :type append: bool
+
+    :param formatter: Строка прокси для
+        формата plain (по-умолчанию ссылка)
+    :type formatter: Union[Callable[[WorkedProxy], str], None]
+
+    :param batch: Через сколько записей
+        сбрасывать файл на диск
+    :type batch: int
+
+    :param interval: Через сколько секунд
+        сбрасывать файл на диск
+    :type interval: float
+    """
+    def __init__(
+            self,
+            path: str,
+            format: Format = 'plain',
+            append: bool = False,
+            formatter: Union[Callable[[WorkedProxy], str], None] = None,
+            batch: int = 100,
+            interval: float = 1
+    ):
+        """
+        Иницилизация записи
+
+        :param path: Путь до файла
+        :type path: str
+
+        :param format: Формат файла
+        :type format: Format
+
+        :param append: Дописывать в конец файла
+        :type append: bool
+
+        :param formatter: Строка прокси для формата plain
+        :type formatter: Union[Callable[[WorkedProxy], str], None]
+
+        :param batch: Через сколько записей сбрасывать на диск
+        :type batch: int
+
+        :param interval: Через сколько секунд сбрасывать на диск
+        :type interval: float
+
+        :raises ValueError: Если формат неизвестен
+        """
+        if format not in FORMATS:
+            raise ValueError(
+                f"Unknown format '{format}' (one of {', '.join(FORMATS)})"
+            )
+
+        self.path = path
+        self.format = format
+        self.append = append
+        self.formatter = formatter or (lambda proxy: proxy.url)
+        self.batch = batch if batch > 0 else 1
+        self.interval = interval
+
+        # Новый файл пишется во временный
+        self.target = path if append else path + '.part'
+        self.file = open(
+            self.target, 'a' if append else 'w', encoding='utf-8'
+        )
+
+        # Размер файла до записи (для отмены)
+        self.start = self.file.tell()
+
+        self.written = 0
+        self.unsynced = 0
+        self.synced = time.monotonic()
+
+        if format == 'csv' and not self.start:
+            self.file.write(self.line(None))
+
+        # Дописываем с новой строки
+        elif self.start and not self.ends_with_newline():
+            self.file.write('\n')
+
+    def ends_with_newline(self) -> bool:
+        """
+        Заканчивается ли дописываемый
+        файл переводом строки
+
+        :return: Заканчивается ли переводом строки
+        :rtype: bool
+        """
+        with open(self.target, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b'\n'
+
+    def line(self, proxy: Union[WorkedProxy, None]) -> str:
+        """
+        Строка файла для прокси
+
+        :param proxy: Рабочий прокси (None -
+            заголовок csv)
+        :type proxy: Union[WorkedProxy, None]
+
+        :return: Строка вместе с переводом строки
+        :rtype: str
+        """
+        if self.format == 'jsonl':
+            return json.dumps(proxy.to_dict(), ensure_ascii=False) + '\n'
+
+        if self.format == 'plain':
+            return self.formatter(proxy) + '\n'
+
+        if proxy is None:
+            row = CSV_FIELDS
+        else:
+            timings = proxy.timings
+            row = (
+                proxy.url, proxy.protocol.value, proxy.proxy,
+                proxy.status, proxy.country, proxy.ip or '',
+                *(
+                    (timings.connect, timings.ttfb, timings.total)
+                    if timings else (None, None, None)
+                )
+            )
+
+        line = io.StringIO()
+        csv.writer(line, lineterminator='\n').writerow(row)
+        return line.getvalue()
+
+    def write(self, proxy: WorkedProxy):
+        """
+        Записать рабочий прокси
+
+        :param proxy: Рабочий прокси
+        :type proxy: WorkedProxy
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.file.write(self.line(proxy))
+        self.file.flush()
+        self.written += 1
+        self.unsynced += 1
+
+        if self.unsynced >= self.batch \
+                or time.monotonic() - self.synced >= self.interval:
+            self.sync()
+
+    def sync(self):
+        """
+        Сбросить записанное на диск
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.synced = time.monotonic()
+
+    def close(self):
+        """
+        Сбросить записанное на диск, закрыть
+        файл и заменить им `path` (если
+        файл не дописывался)
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if self.file.closed:
+            return
+
+        self.sync()
+        self.file.close()
+        if not self.append:
+            os.replace(self.target, self.path)
+
+    def abort(self):
+        """
+        Отменить запись: удалить временный
+        файл, либо вернуть дописываемый
+        файл к исходному размеру
+
+        :return: Ничего не возвращает
+        :rtype: None
+        """
+        if self.file.closed:
+            return
+
+        if self.append:
+            self.file.flush()
+            self.file.truncate(self.start)
+            self.file.close()
+        else:
+            self.file.close()
+            os.remove(self.target)
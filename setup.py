@@ -40,6 +40,9 @@ if __name__ == '__main__':
             'fake-useragent',
             'PyEventEmitter'
         ],
+        extras_require={
+            'uvloop': ['uvloop']
+        },
 
         entry_points={
             "console_scripts": [
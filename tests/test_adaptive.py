@@ -0,0 +1,113 @@
+"""Тесты адаптивного лимита проверок"""
+# Standarts
+import sys
+import asyncio
+import unittest
+import multiprocessing
+
+# Fake proxies
+from benchmarks.fake_proxies import serve
+
+# Taster
+from proxies_taster import ProxiesTaster
+
+
+# Лимит дескрипторов процесса проверки
+NOFILE = 80
+
+# Количество прокси и начальных "воркеров"
+COUNT = 300
+WORKERS = 300
+
+
+def check(ports: dict, protocol: str, connection):
+    """
+    Проверить прокси при низком
+    RLIMIT_NOFILE и передать количество
+    рабочих через `connection`
+    """
+    import resource
+    resource.setrlimit(resource.RLIMIT_NOFILE, (NOFILE, NOFILE))
+
+    async def main():
+        # Прокси без протокола проверяются
+        # перебором (сначала SOCKS)
+        address = f"127.0.0.1:{ports[protocol or 'http']['working']}"
+        taster = ProxiesTaster(
+            [f"{protocol}://{address}" if protocol else address] * COUNT
+        )
+        taster.set_judge(f"http://127.0.0.1:{ports['judge']}/")
+        taster.set_workers(WORKERS)
+        taster.set_adaptive(True)
+        try:
+            return len(await taster.run())
+        finally:
+            await taster.close()
+
+    connection.send(asyncio.run(main()))
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'RLIMIT_NOFILE')
+class ResourceCeilingTest(unittest.TestCase):
+    """
+    Нехватка дескрипторов при адаптивном
+    лимите уменьшает лимит, а не прерывает
+    проверку
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.context = multiprocessing.get_context('spawn')
+        receiver, sender = cls.context.Pipe(False)
+        cls.proxies = cls.context.Process(
+            target=serve, args=(sender, 1), daemon=True
+        )
+        cls.proxies.start()
+        cls.ports = receiver.recv()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.proxies.terminate()
+        cls.proxies.join()
+
+    def run_checking(self, protocol: str) -> int:
+        receiver, sender = self.context.Pipe(False)
+        process = self.context.Process(
+            target=check, args=(self.ports, protocol, sender)
+        )
+        process.start()
+        try:
+            # Упавшая проверка ничего не передает
+            for _ in range(120):
+                if receiver.poll(1) or not process.is_alive():
+                    break
+            self.assertTrue(receiver.poll(), 'checking did not finish')
+            return receiver.recv()
+        finally:
+            process.join(10)
+            if process.is_alive():
+                process.kill()
+
+    def test_socks(self):
+        self.assertEqual(self.run_checking('socks5'), COUNT)
+
+    def test_untagged(self):
+        self.assertEqual(self.run_checking(''), COUNT)
+
+    def test_success_observed_once(self):
+        async def main():
+            taster = ProxiesTaster(
+                [f"http://127.0.0.1:{self.ports['http']['working']}"] * 5
+            )
+            taster.set_judge(f"http://127.0.0.1:{self.ports['judge']}/")
+            taster.set_adaptive(True)
+            try:
+                worked = await taster.run()
+            finally:
+                await taster.close()
+            return len(worked), taster.semaphore.successes
+
+        self.assertEqual(asyncio.run(main()), (5, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""Тесты хранилища результатов проверок"""
+# Standarts
+import os
+import tempfile
+import unittest
+
+# Taster
+from proxies_taster import Protocol
+from proxies_taster.cache import ResultsCache
+
+
+class ResultsCacheTest(unittest.TestCase):
+    """
+    Результаты хранятся отдельно для
+    каждого протокола проверки
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'results.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_protocols_are_separate(self):
+        cache = ResultsCache(self.path, batch=1)
+        cache.put('1.1.1.1:80', False, requested=Protocol.SOCKS5)
+        cache.put('1.1.1.1:80', True, Protocol.HTTP, 0.5)
+
+        self.assertFalse(cache.get('1.1.1.1:80', Protocol.SOCKS5).alive)
+        self.assertIsNone(cache.get('1.1.1.1:80', Protocol.HTTP))
+
+        record = cache.get('1.1.1.1:80')
+        self.assertTrue(record.alive)
+        self.assertIsNone(record.requested)
+        self.assertEqual(record.protocol, Protocol.HTTP)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
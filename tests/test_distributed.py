@@ -0,0 +1,69 @@
+"""Тесты распределенной проверки"""
+# Standarts
+import os
+import asyncio
+import tempfile
+import unittest
+
+# Taster
+from proxies_taster import ProxiesTaster
+from proxies_taster.distributed import Worker
+from proxies_taster.distributed import Coordinator
+
+
+# Порт, на котором заведомо ничего не слушает
+DEAD = 'http://127.0.0.1:1'
+
+
+class CoordinatorFinishTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Координатор заканчивает работу, даже
+    если прокси закончились только после
+    проверки последней пачки
+    """
+    async def run_checking(self, count: int, batch: int, prefetch: int):
+        with tempfile.TemporaryDirectory() as directory:
+            address = 'unix:' + os.path.join(directory, 'coordinator.sock')
+            coordinator = Coordinator([DEAD] * count, batch=batch, lease=5)
+
+            async def collect():
+                return [worked async for worked in coordinator.serve(address)]
+
+            serving = asyncio.ensure_future(collect())
+            await asyncio.sleep(0.1)
+
+            taster = ProxiesTaster([])
+            taster.set_workers(10)
+            checked = await asyncio.wait_for(
+                Worker(taster, address, prefetch=prefetch).run(), 30
+            )
+            worked = await asyncio.wait_for(serving, 30)
+
+        self.assertEqual(checked, count)
+        self.assertEqual(coordinator.checked, count)
+        self.assertEqual(worked, [])
+
+    async def test_prefetch_one(self):
+        await self.run_checking(10, 4, 1)
+
+    async def test_prefetch_one_single_batch(self):
+        await self.run_checking(2, 100, 1)
+
+    async def test_prefetch_default(self):
+        await self.run_checking(10, 4, 2)
+
+
+class WorkerTest(unittest.TestCase):
+    """
+    "Воркер" не принимает ProxiesTaster
+    с несколькими процессами
+    """
+    def test_processes_rejected(self):
+        taster = ProxiesTaster([])
+        taster.set_processes(2)
+        with self.assertRaises(ValueError):
+            Worker(taster, '127.0.0.1:7500')
+
+
+if __name__ == '__main__':
+    unittest.main()
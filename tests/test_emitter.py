@@ -0,0 +1,54 @@
+"""Тесты обработчиков событий"""
+# Standarts
+import asyncio
+import unittest
+
+# Emitter
+from proxies_taster.emitter import Emitter
+
+
+class QueuedListenerTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Буфер медленного обработчика
+    ограничен, даже если события
+    передаются без ожидания
+    """
+    async def test_buffer_is_bounded(self):
+        received = []
+
+        async def slow(event):
+            await asyncio.sleep(0.01)
+            received.append(event)
+
+        emitter = Emitter()
+        emitter.on('event', slow, buffer=10)
+        for index in range(1000):
+            emitter.emit('event', index)
+
+        queued = emitter.queued[0]
+        self.assertLessEqual(len(queued.events), 20)
+        self.assertEqual(queued.dropped, 1000 - 20)
+
+        await emitter.flush()
+        self.assertEqual(received, list(range(980, 1000)))
+
+    async def test_waiting_emitter_loses_nothing(self):
+        received = []
+
+        async def slow(event):
+            await asyncio.sleep(0)
+            received.append(event)
+
+        emitter = Emitter()
+        emitter.on('event', slow, buffer=10)
+        for index in range(100):
+            emitter.emit('event', index)
+            await emitter.wait()
+
+        await emitter.flush()
+        self.assertEqual(received, list(range(100)))
+        self.assertEqual(emitter.queued[0].dropped, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Тесты журнала проверки"""
+# Standarts
+import os
+import tempfile
+import unittest
+
+# Taster
+from proxies_taster.journal import Journal
+
+
+class JournalTest(unittest.TestCase):
+    """
+    Непустой журнал не перезаписывается
+    без явного разрешения
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self):
+        journal = Journal(self.path)
+        journal.record('1.1.1.1:80', False)
+        journal.close()
+
+    def test_not_empty_is_kept(self):
+        self.record()
+        with self.assertRaises(FileExistsError):
+            Journal(self.path)
+
+        journal = Journal(self.path, resume=True)
+        self.assertEqual(journal.checked, {'1.1.1.1:80'})
+        journal.close()
+
+    def test_overwrite(self):
+        self.record()
+        journal = Journal(self.path, overwrite=True)
+        self.assertEqual(journal.checked, set())
+        journal.close()
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_empty_is_reused(self):
+        open(self.path, 'w').close()
+        Journal(self.path).close()
+
+
+if __name__ == '__main__':
+    unittest.main()
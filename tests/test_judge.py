@@ -0,0 +1,85 @@
+"""Тесты адресов и протоколов "судьи" """
+# Standarts
+import asyncio
+import unittest
+import multiprocessing
+
+# Fake proxies
+from benchmarks.fake_proxies import serve
+
+# Taster
+from proxies_taster import Protocol
+from proxies_taster import ProxiesTaster
+from proxies_taster.judge import Judge
+
+
+class JudgeTest(unittest.TestCase):
+    """
+    Адреса "судьи" по протоколам
+    """
+    def test_explicit_port_is_kept(self):
+        judge = Judge.from_url('https://judge:8443/json')
+        self.assertEqual(judge.url, 'http://judge:8443/json')
+        self.assertEqual(judge.https_url, 'https://judge:8443/json')
+
+        judge = Judge.from_url('https://judge/json')
+        self.assertEqual(judge.url, 'http://judge/json')
+
+    def test_https_needs_https_url(self):
+        judge = Judge.from_url('http://judge:8080/')
+        self.assertFalse(judge.supports(Protocol.HTTPS))
+        self.assertTrue(judge.supports(Protocol.HTTP))
+        self.assertTrue(judge.supports(Protocol.SOCKS5))
+        self.assertTrue(
+            Judge.from_url('https://judge/').supports(Protocol.HTTPS)
+        )
+
+
+class HttpJudgeTest(unittest.TestCase):
+    """
+    Через "судью" без https адреса HTTP
+    прокси не выдается за HTTPS
+    """
+    @classmethod
+    def setUpClass(cls):
+        context = multiprocessing.get_context('spawn')
+        receiver, sender = context.Pipe(False)
+        cls.proxies = context.Process(
+            target=serve, args=(sender, 1), daemon=True
+        )
+        cls.proxies.start()
+        cls.ports = receiver.recv()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.proxies.terminate()
+        cls.proxies.join()
+
+    def check(self, proxy: str, **settings):
+        async def main():
+            taster = ProxiesTaster([proxy])
+            taster.set_judge(f"http://127.0.0.1:{self.ports['judge']}/")
+            for name, value in settings.items():
+                getattr(taster, name)(value)
+            try:
+                return [worked.url for worked in await taster.run()]
+            finally:
+                await taster.close()
+
+        return asyncio.run(main())
+
+    def test_untagged(self):
+        proxy = f"127.0.0.1:{self.ports['http']['working']}"
+        for settings in ({}, {'set_racing': True}, {'set_probing': True}):
+            with self.subTest(**settings):
+                self.assertEqual(self.check(proxy, **settings), [
+                    f"http://{proxy}"
+                ])
+
+    def test_tagged_https(self):
+        proxy = f"127.0.0.1:{self.ports['http']['working']}"
+        self.assertEqual(self.check(f"https://{proxy}"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
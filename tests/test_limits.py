@@ -0,0 +1,66 @@
+"""Тесты лимитов процесса проверки"""
+# Standarts
+import asyncio
+import unittest
+from unittest import mock
+
+# Taster
+from proxies_taster import ProxiesTaster
+from proxies_taster import limits
+from proxies_taster.processes import child_settings
+
+
+class AutoWorkersTest(unittest.TestCase):
+    """
+    Локальные порты делятся между
+    процессами проверки
+    """
+    def setUp(self):
+        patches = [
+            mock.patch.object(limits, 'nofile_limit', return_value=100000),
+            mock.patch.object(limits, 'port_capacity', return_value=28000)
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_ports_are_shared(self):
+        self.assertEqual(limits.auto_workers(), 28000)
+        self.assertEqual(limits.auto_workers(processes=4), 7000)
+        self.assertEqual(limits.auto_workers(extra=100, processes=4), 6900)
+
+    def test_child_settings(self):
+        taster = ProxiesTaster([])
+        taster.set_workers('auto')
+        settings = child_settings(taster, 4)
+        self.assertEqual(settings['set_workers'], ((7000,), {}))
+
+        # Настройки самого taster не меняются
+        self.assertEqual(taster.settings['set_workers'], (('auto',), {}))
+
+    def test_resolved_on_start(self):
+        # 'auto' задан раньше настроек, от которых зависит
+        taster = ProxiesTaster([])
+        taster.set_workers('auto')
+        taster.set_probing(True)
+        self.assertEqual(taster.workers, 28000)
+
+        async def start():
+            return [worked async for worked in taster.stream([])]
+
+        # Лимит здесь - дескрипторы, а не порты
+        with mock.patch.object(limits, 'port_capacity', return_value=None):
+            asyncio.run(start())
+        self.assertEqual(taster.workers, (100000 - 128) // 3)
+        self.assertEqual(
+            child_settings(taster, 4)['set_workers'], ((7000,), {})
+        )
+
+    def test_explicit_workers(self):
+        taster = ProxiesTaster([])
+        taster.set_workers(50)
+        self.assertEqual(child_settings(taster, 4)['set_workers'], ((50,), {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
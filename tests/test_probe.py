@@ -0,0 +1,94 @@
+"""Тесты определения протокола рукопожатием"""
+# Standarts
+import time
+import asyncio
+import unittest
+import multiprocessing
+
+# Fake proxies
+from benchmarks.fake_proxies import serve
+
+# Taster
+from proxies_taster import Protocol
+from proxies_taster.probe import fingerprint
+
+
+class FingerprintTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Определение протокола прокси
+    """
+    @classmethod
+    def setUpClass(cls):
+        context = multiprocessing.get_context('spawn')
+        receiver, sender = context.Pipe(False)
+        cls.proxies = context.Process(
+            target=serve, args=(sender, 1), daemon=True
+        )
+        cls.proxies.start()
+        cls.ports = receiver.recv()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.proxies.terminate()
+        cls.proxies.join()
+
+    async def test_protocols(self):
+        target = ('127.0.0.1', self.ports['judge'])
+        for name, protocol in (
+                ('socks5', Protocol.SOCKS5),
+                ('socks4', Protocol.SOCKS4),
+                ('http', Protocol.HTTPS)
+        ):
+            with self.subTest(name):
+                self.assertEqual(
+                    await fingerprint(
+                        '127.0.0.1', self.ports[name]['working'],
+                        timeout=2, target=target
+                    ),
+                    protocol
+                )
+
+    async def test_silent_proxy_is_bounded(self):
+        # Принимает соединения, но не отвечает
+        async def silent(reader, writer):
+            await reader.read()
+            writer.close()
+
+        server = await asyncio.start_server(silent, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            started = time.monotonic()
+            self.assertFalse(await fingerprint('127.0.0.1', port, timeout=1))
+            self.assertLess(time.monotonic() - started, 1.5)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    async def test_one_socket_at_a_time(self):
+        # Закрывает соединение после запроса
+        opened = []
+        active = 0
+
+        async def closing(reader, writer):
+            nonlocal active
+            active += 1
+            opened.append(active)
+            await reader.read(1)
+            await asyncio.sleep(0.05)
+            active -= 1
+            writer.close()
+
+        server = await asyncio.start_server(closing, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            self.assertFalse(await fingerprint('127.0.0.1', port, timeout=2))
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        self.assertEqual(len(opened), 3)
+        self.assertEqual(max(opened), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()